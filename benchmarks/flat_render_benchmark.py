@@ -0,0 +1,67 @@
+# Compare the render time of a deep tree of stacks with and without flat rendering
+import guiscript as guis
+import pygame
+import time
+
+pygame.init()
+screen = pygame.display.set_mode((1200, 750))
+
+FRAMES = 200
+DEPTH = 2
+LEAVES = 5
+LEAF_SIZE = (240, 30)
+MARGIN = 16
+
+
+def tree_size(depth: int) -> tuple[int, int]:
+    if depth <= 0:
+        return LEAF_SIZE[0]+MARGIN, LEAVES*(LEAF_SIZE[1]+4)+MARGIN
+    w, h = tree_size(depth-1)
+    if depth % 2 == 0:
+        return w*2+MARGIN, h+MARGIN
+    return w+MARGIN, h*2+MARGIN
+
+
+def build_tree(depth: int):
+    size = tree_size(depth)
+    if depth <= 0:
+        with guis.VStack(guis.SizeR(*size)):
+            for i in range(LEAVES):
+                if i % 3 == 0:
+                    guis.Text(f"Text {i}", guis.SizeR(*LEAF_SIZE))
+                elif i % 3 == 1:
+                    guis.Button(f"Button {i}", guis.SizeR(*LEAF_SIZE))
+                else:
+                    guis.Checkbox(guis.SizeR(LEAF_SIZE[1], LEAF_SIZE[1]))
+        return
+    with (guis.HStack if depth % 2 == 0 else guis.VStack)(guis.SizeR(*size)):
+        build_tree(depth-1)
+        build_tree(depth-1)
+
+
+def measure(flat_render: bool, dirty_leaves_only: bool) -> float:
+    manager = guis.Manager(screen, flat_render=flat_render)
+    with guis.HStack(guis.SizeR(1200, 750)) as container:
+        for _ in range(2):
+            build_tree(DEPTH)
+    manager.logic()
+    manager.render()
+    leaves = [element for element in manager._all_elements if len(element.children) == 0]
+    elapsed = 0
+    for _ in range(FRAMES):
+        for element in (leaves if dirty_leaves_only else manager._all_elements):
+            element.set_dirty()
+        start = time.perf_counter()
+        manager.render()
+        elapsed += time.perf_counter()-start
+    container.destroy()
+    return elapsed/FRAMES*1000
+
+
+for dirty_leaves_only, title in [(True, "leaves changed"), (False, "full recomposite")]:
+    normal = measure(False, dirty_leaves_only)
+    flat = measure(True, dirty_leaves_only)
+    print(f"{title}:")
+    print(f"    normal render: {normal:.3f} ms/frame")
+    print(f"    flat render:   {flat:.3f} ms/frame ({normal/flat:.2f}x)")
+pygame.quit()
@@ -0,0 +1,70 @@
+# Compare the character and regex GSS lexers on a synthetic stylesheet, checking they produce the same tokens
+from guiscript._guis.script import UIScriptLexer, UIScriptRegexLexer, UIScriptParser
+import pygame
+import random
+import time
+import gc
+
+pygame.init()
+screen = pygame.display.set_mode((100, 100))
+
+RULES = 10000
+REPEATS = 3
+VARIABLES = {"DARK": (12, 12, 12), "RADIUS": 9}
+
+
+def make_rule(i: int) -> str:
+    selector = random.choice([f".style_{i}", f"#element_{i}", f".style_{i}, alt_{i}", f"text_{i}"])
+    style_type = random.choice(["", ":hover", ":press", "::", ":hover:press"])
+    properties = [
+        f"bg.color ({i % 256}, {(i*7) % 256}, {(i*13) % 256})",
+        f"bg.border_radius $RADIUS",
+        f"outline.width -{i % 4}",
+        f"outline.color #{i % 256:02x}ff{(i*3) % 256:02x}",
+        f"text.font_size {12+i % 20}.5",
+        f"text.font_name 'Font {i}'",
+        f"text.bold {random.choice(['true', 'false'])}",
+        f"image.image null",
+        f"stack.padding |{i % 10}*2|",
+        f"shape.type rect",
+        f"stack.anchor middle",
+    ]
+    body = ";\n    ".join(random.sample(properties, 5))
+    comment = f"/ rule {i}\n" if i % 5 == 0 else ""
+    return f"{comment}{selector}{style_type} {{\n    {body};\n    % bg.color $DARK, {100+i % 400};\n}}\n"
+
+
+def measure(lexer_class: type, source: str) -> tuple[float, float]:
+    lex_time = parse_time = 0
+    for _ in range(REPEATS):
+        gc.collect()
+        start = time.perf_counter()
+        tokens = lexer_class(source, "benchmark.gss").lex().tokens
+        lex_time += time.perf_counter()-start
+        start = time.perf_counter()
+        UIScriptParser(tokens, "benchmark.gss", VARIABLES).parse()
+        parse_time += time.perf_counter()-start
+        del tokens
+    return lex_time/REPEATS*1000, parse_time/REPEATS*1000
+
+
+def count_mismatches(source: str) -> tuple[int, int]:
+    char_tokens = UIScriptLexer(source, "benchmark.gss").lex().tokens
+    regex_tokens = UIScriptRegexLexer(source, "benchmark.gss").lex().tokens
+    mismatches = abs(len(char_tokens)-len(regex_tokens))
+    for char_token, regex_token in zip(char_tokens, regex_tokens):
+        if (char_token.type, char_token.value, char_token.line, char_token.col) != (regex_token.type, regex_token.value, regex_token.line, regex_token.col):
+            mismatches += 1
+    return len(char_tokens), mismatches
+
+
+random.seed(0)
+source = "".join(make_rule(i) for i in range(RULES))
+num_tokens, mismatches = count_mismatches(source)
+char_lex, char_parse = measure(UIScriptLexer, source)
+regex_lex, regex_parse = measure(UIScriptRegexLexer, source)
+
+print(f"{RULES} rules, {len(source)} characters, {num_tokens} tokens, {mismatches} mismatching tokens")
+print(f"    character lexer: {char_lex:.1f} ms lex + {char_parse:.1f} ms parse")
+print(f"    regex lexer:     {regex_lex:.1f} ms lex + {regex_parse:.1f} ms parse ({char_lex/regex_lex:.2f}x lexing)")
+pygame.quit()
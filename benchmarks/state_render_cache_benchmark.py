@@ -0,0 +1,74 @@
+# Compare moving the hover across a toolbar of buttons with and without the state render cache
+import guiscript as guis
+import pygame
+import time
+
+pygame.init()
+screen = pygame.display.set_mode((1200, 750))
+icon = pygame.Surface((24, 24), pygame.SRCALPHA)
+pygame.draw.circle(icon, "white", (12, 12), 10, 4)
+guis.Icons.add("settings", icon)
+
+FRAMES = 400
+ROWS = 2
+COLUMNS = 12
+BUTTON_SIZE = (90, 40)
+STYLE = """
+button {
+    bg.border_radius 10;
+    outline.width 2;
+    outline.border_radius 10;
+    text.font_size 22;
+}
+"""
+
+
+def build_toolbar():
+    with guis.VStack(guis.SizeR(COLUMNS*(BUTTON_SIZE[0]+6)+20, ROWS*(BUTTON_SIZE[1]+16)+10)) as container:
+        for row in range(ROWS):
+            with guis.HStack(guis.SizeR(COLUMNS*(BUTTON_SIZE[0]+6)+10, BUTTON_SIZE[1]+10)):
+                for column in range(COLUMNS):
+                    match column % 3:
+                        case 0:
+                            guis.Button(f"Button {row}.{column}", guis.SizeR(*BUTTON_SIZE))
+                        case 1:
+                            guis.IconButton("settings", guis.SizeR(BUTTON_SIZE[1], BUTTON_SIZE[1]))
+                        case 2:
+                            guis.Checkbox(guis.SizeR(BUTTON_SIZE[1], BUTTON_SIZE[1]))
+    return container
+
+
+def measure(state_render_cache: bool) -> tuple[float, int, int]:
+    manager = guis.Manager(screen, gss_sources=[STYLE], state_render_cache=state_render_cache)
+    container = build_toolbar()
+    buttons = [element for element in manager._all_elements if element.state_cacheable]
+    manager.logic()
+    manager.render()
+    manager.stats.enable()
+    renders = cached = 0
+    elapsed = 0
+    previous = buttons[0]
+    for i in range(FRAMES):
+        # move the hover to the next button, like a mouse sweeping the toolbar
+        button = buttons[i % len(buttons)]
+        start = time.perf_counter()
+        previous.status.hovered = False
+        button.status.hovered = True
+        previous._logic()
+        button._logic()
+        manager.render()
+        elapsed += time.perf_counter()-start
+        renders += manager.stats.last_frame["render"]
+        cached += manager.stats.last_frame["render_cached"]
+        previous = button
+    container.destroy()
+    manager.destroy()
+    return elapsed/FRAMES*1000, renders, cached
+
+
+normal, normal_renders, _ = measure(False)
+cached, cached_renders, hits = measure(True)
+print(f"{ROWS*COLUMNS} toolbar elements, {FRAMES} hover moves:")
+print(f"    without cache: {normal:.3f} ms/frame, {normal_renders} renders")
+print(f"    with cache:    {cached:.3f} ms/frame, {cached_renders} renders, {hits} cached surfaces reused ({normal/cached:.2f}x)")
+pygame.quit()
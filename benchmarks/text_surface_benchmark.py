@@ -0,0 +1,36 @@
+# Compare creating and restyling a list of repeated labels with and without the shared text surfaces
+import guiscript as guis
+import pygame
+import time
+
+pygame.init()
+screen = pygame.display.set_mode((1200, 750))
+
+ELEMENTS = 1500
+LABELS = ["OK", "Cancel", "Apply", "Open file", "Save as...", "Delete selected rows"]
+REPEATS = 3
+
+
+def measure(max_bytes: int) -> tuple[float, dict[str, int]]:
+    guis.TextSurfaces.clear().reset_counters().set_max_bytes(max_bytes)
+    elapsed = 0
+    for _ in range(REPEATS):
+        manager = guis.Manager(screen)
+        start = time.perf_counter()
+        with guis.VStack(guis.SizeR(1200, 750)):
+            buttons = [guis.Button(LABELS[i % len(LABELS)], guis.SizeR(200, 30))
+                       for i in range(ELEMENTS)]
+        for button in buttons:
+            button.set_text(LABELS[(LABELS.index(button.get_text())+1) % len(LABELS)])
+        elapsed += time.perf_counter()-start
+        manager.destroy()
+    return elapsed/REPEATS*1000, guis.TextSurfaces.get_stats()
+
+
+default_max_bytes = guis.TextSurfaces.max_bytes
+uncached, _ = measure(0)
+cached, stats = measure(default_max_bytes)
+print(f"{ELEMENTS} buttons with {len(LABELS)} different labels, created and relabeled:")
+print(f"    without cache: {uncached:.1f} ms")
+print(f"    with cache:    {cached:.1f} ms ({uncached/cached:.2f}x), {stats['hits']} hits, {stats['misses']} misses, {stats['bytes']} bytes")
+pygame.quit()
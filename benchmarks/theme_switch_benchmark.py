@@ -0,0 +1,69 @@
+# Compare switching theme by reparsing the GSS and recreating the elements with precompiled themes
+import guiscript as guis
+import pygame
+import time
+
+pygame.init()
+screen = pygame.display.set_mode((1200, 750))
+
+ELEMENTS = 2000
+SWITCHES = 10
+STYLES = 50
+
+
+def make_theme(bg: tuple[int, int, int], text: tuple[int, int, int], font_size: int) -> str:
+    rules = [f"button {{ bg.color {bg}; text.color {text}; text.font_size {font_size}; }}",
+             f"button:hover {{ bg.color {tuple(min(255, c+30) for c in bg)}; }}"]
+    for i in range(STYLES):
+        rules.append(
+            f".style_{i} {{ outline.width {1+i % 3}; outline.color {text}; bg.border_radius {i % 8}; }}")
+    return "\n".join(rules)
+
+
+THEMES = {"light": make_theme((230, 230, 230), (20, 20, 20), 20),
+          "dark": make_theme((30, 30, 30), (230, 230, 230), 21)}
+
+
+def build_elements():
+    with guis.VStack(guis.SizeR(1200, 750), style_id="invis_cont"):
+        for i in range(ELEMENTS):
+            guis.Button(f"Button {i}", guis.SizeR(200, 30),
+                        style_id=f"style_{i % STYLES}")
+
+
+def measure_reparse() -> float:
+    elapsed = 0
+    for i in range(SWITCHES):
+        name = list(THEMES)[i % 2]
+        start = time.perf_counter()
+        manager = guis.Manager(screen, gss_sources=[THEMES[name]])
+        build_elements()
+        elapsed += time.perf_counter()-start
+        manager.destroy()
+    return elapsed/SWITCHES*1000
+
+
+def measure_themes() -> tuple[float, float]:
+    manager = guis.Manager(screen)
+    for name, source in THEMES.items():
+        manager.add_theme(name, gss_sources=[source])
+    manager.set_theme("light")
+    build_elements()
+    start = time.perf_counter()
+    manager.set_theme("dark")
+    first = (time.perf_counter()-start)*1000
+    elapsed = 0
+    for i in range(SWITCHES):
+        start = time.perf_counter()
+        manager.set_theme(list(THEMES)[i % 2])
+        elapsed += time.perf_counter()-start
+    manager.destroy()
+    return first, elapsed/SWITCHES*1000
+
+
+reparse = measure_reparse()
+first, switch = measure_themes()
+print(f"{ELEMENTS} buttons, {STYLES} style ids:")
+print(f"    reparse and recreate: {reparse:.1f} ms/switch")
+print(f"    set_theme:            {first:.1f} ms first switch, {switch:.1f} ms/switch after ({reparse/switch:.2f}x)")
+pygame.quit()
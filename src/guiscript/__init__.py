@@ -17,6 +17,11 @@ from ._guis.manager import Manager
 from ._guis.icon import Icons
 from ._guis.buffer import Buffer
 from ._guis.tooltip import Tooltips
+from ._guis.surfacepool import SurfacePool
+from ._guis.fonts import Fonts
+from ._guis.texts import TextSurfaces
+from ._guis.images import Images
+from ._guis.backends import RenderBackend, SurfaceBackend, RendererBackend
 
 from ._guis.enums import (
     TextAlign, 
@@ -125,6 +130,7 @@ from ._guis.types import (
     InteractType,
     NavigationType,
     CursorsType,
+    StatsType,
     CompType,
     BGCompType,
     ImageCompType,
@@ -192,7 +192,11 @@ class UIStyleAnim(UIAnimation):
         for style in self.styles:
             setattr(getattr(style, self.comp_name),
                     self.property_name, self.current_value)
-            style.dirty = True
+            if self.comp_name == "stack":
+                style.dirty = True
+            else:
+                # only the animated component has to be built again
+                style.dirty_components.add(self.comp_name)
             if self.should_build_font:
                 style.text.build_font()
         return self
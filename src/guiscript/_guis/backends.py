@@ -0,0 +1,57 @@
+import pygame
+import typing
+from pygame._sdl2 import video
+if typing.TYPE_CHECKING:
+    from .elements.element import Element
+    from .elements.root import UIRoot
+
+
+class RenderBackend:
+    """Base class for render backends, that compose the top level elements on the screen"""
+
+    def _compose(self, root: "UIRoot", element: "Element", position: pygame.Vector2, rerendered: bool):
+        ...
+
+    def _forget(self, element: "Element"):
+        ...
+
+    def clear(self) -> typing.Self:
+        """Release any resource held for the elements"""
+        return self
+
+
+class SurfaceBackend(RenderBackend):
+    """Default render backend. Top level elements are blitted on the manager screen surface"""
+
+    def _compose(self, root: "UIRoot", element: "Element", position: pygame.Vector2, rerendered: bool):
+        root.screen_surface.blit(element.element_surface, position)
+
+
+class RendererBackend(RenderBackend):
+    """
+    Render backend using a pygame._sdl2.video.Renderer. Each top level element is uploaded to a texture only when it re-renders and the textures are drawn by the renderer\n
+    The manager screen surface is only used for its size, and clearing/presenting the renderer is left to the user
+    """
+
+    def __init__(self, renderer: video.Renderer):
+        self.renderer: video.Renderer = renderer
+        self.textures: dict["Element", video.Texture] = {}
+
+    def _compose(self, root: "UIRoot", element: "Element", position: pygame.Vector2, rerendered: bool):
+        surface = element.element_surface
+        texture = self.textures.get(element, None)
+        if texture is None or (texture.width, texture.height) != surface.get_size():
+            texture = video.Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = pygame.BLENDMODE_BLEND
+            self.textures[element] = texture
+        elif rerendered:
+            texture.update(surface)
+        texture.draw(dstrect=pygame.Rect(position, surface.get_size()))
+
+    def _forget(self, element: "Element"):
+        self.textures.pop(element, None)
+
+    def clear(self) -> typing.Self:
+        """Release the element textures"""
+        self.textures.clear()
+        return self
@@ -1,17 +1,20 @@
 import pygame
 import typing
+import copy
 if typing.TYPE_CHECKING:
     from .elements.element import Element
 
 from .style import UIStyleGroup, UIStyle
 from .error import UIError
 from .icon import Icons
+from .texts import TextSurfaces
 from . import common
 from . import richtext
 
 
 class UIComponent:
-    """Base class for element components"""
+    """Base class for element components. style_name is the component style the build reads, None meaning it's rebuilt on every style change"""
+    style_name: str | None = None
 
     def __init__(self, element: "Element", style_change_callback=None):
         self.element: "Element" = element
@@ -43,23 +46,27 @@ class UIComponent:
 
     def force_enable(self) -> typing.Self:
         """Force the component to stay enabled"""
+        self.element._clear_state_surfaces()
         self.enabled = True
         self.force_visibility = True
         return self
 
     def force_disable(self) -> typing.Self:
         """Force the component to stay disabled"""
+        self.element._clear_state_surfaces()
         self.enabled = False
         return self
 
     def dont_force(self) -> typing.Self:
         """Don't force visibility over the component"""
+        self.element._clear_state_surfaces()
         self.force_visibility = False
         return self
 
 
 class UIBackgroundComp(UIComponent):
     """Element component that renders a background"""
+    style_name: str = "bg"
 
     def _render(self):
         if not self.element.style.bg.enabled and not self.force_visibility:
@@ -73,6 +80,7 @@ class UIBackgroundComp(UIComponent):
 
 class UIImageComp(UIComponent):
     """Element component that renders an image"""
+    style_name: str = "image"
 
     def _init(self):
         self.image_surf: pygame.Surface = None
@@ -93,6 +101,7 @@ class UIImageComp(UIComponent):
         if surface == self.original_surface and not force_update:
             return self
         self.original_surface: pygame.Surface = surface
+        self.element._clear_state_surfaces()
         self._build(self.element.style)
         return self
 
@@ -103,6 +112,8 @@ class UIImageComp(UIComponent):
         original_surface = self.original_surface if self.original_surface else style.image.image
         if not original_surface:
             return
+        if self.element.manager.stats.enabled:
+            self.element.manager.stats.frame["build_image"] += 1
         original_surface = original_surface.copy()
         original_surface = pygame.transform.scale_by(
             original_surface, style.image.border_scale)
@@ -176,13 +187,17 @@ class UIImageComp(UIComponent):
 
 class UIShapeComp(UIComponent):
     """Element component that renders a shape"""
+    style_name: str = "shape"
 
     def _init(self):
         self.custom_rect = None
+        self._polygon_source: tuple | None = None
+        self._polygon_points: list[pygame.Vector2] = []
 
     def set_custom_rect(self, rect: pygame.Rect | None) -> typing.Self:
         """If the shape type is 'rect', draw the given rect instead of the automated one"""
         self.custom_rect = rect
+        self.element._clear_state_surfaces()
         self.element.set_dirty()
         return self
 
@@ -218,13 +233,15 @@ class UIShapeComp(UIComponent):
                                      self.element.relative_rect.h-style.shape.ellipse_padding_y*2),
                                     style.shape.outline_width)
             case "polygon":
-                points = []
-                for p in style.shape.polygon_points:
-                    points.append(pygame.Vector2(
-                        p)+self.element.static_rect.center)
+                source = (self.element.static_rect.center,
+                          style.shape.polygon_points)
+                if source != self._polygon_source:
+                    self._polygon_source = copy.deepcopy(source)
+                    self._polygon_points = [pygame.Vector2(p)+self.element.static_rect.center
+                                            for p in style.shape.polygon_points]
                 pygame.draw.polygon(self.element.element_surface,
                                     style.shape.color,
-                                    points,
+                                    self._polygon_points,
                                     style.shape.outline_width)
             case "_":
                 raise UIError(
@@ -232,6 +249,7 @@ class UIShapeComp(UIComponent):
 
 class UITextComp(UIComponent):
     """Element component that renders text"""
+    style_name: str = "text"
 
     def _init(self):
         self.text: str = None
@@ -277,6 +295,8 @@ class UITextComp(UIComponent):
         self._build(self.element.style)
 
     def _build(self, style):
+        if self.element.manager.stats.enabled:
+            self.element.manager.stats.frame["build_text"] += 1
         text = style.text.text if style.text.text else self.text
         if text.strip() and text[-1] == "\n":
             text += " "
@@ -285,11 +305,12 @@ class UITextComp(UIComponent):
         if not style.text.rich:
             self.real_text = text
             style.text.apply_mods()
-            self.text_surf: pygame.Surface = style.text.font.render(text,
-                                                                    style.text.antialas,
-                                                                    style.text.color,
-                                                                    style.text.bg_color,
-                                                                    max(self.element.relative_rect.w, 1) if style.text.do_wrap else 0)
+            self.text_surf: pygame.Surface = TextSurfaces.render(style.text.font,
+                                                                 text,
+                                                                 style.text.antialas,
+                                                                 style.text.color,
+                                                                 style.text.bg_color,
+                                                                 max(self.element.relative_rect.w, 1) if style.text.do_wrap else 0)
         else:
             default_modifiers = {
                 richtext.ModifierName.font_name: style.text.font_name if style.text.font_name != "googleicons" else None,
@@ -331,11 +352,12 @@ class UITextComp(UIComponent):
         """Return the minimum height necessary to fit some text with the current style and width, useful for dynamic-sizing text elements. A custom width can be provided as argument"""
         style = self.element.style.text
         style.apply_mods()
-        return style.font.render(text,
-                                 style.antialas,
-                                 style.color,
-                                 style.bg_color,
-                                 (self.element.relative_rect.w if style.do_wrap else 0) if not max_w else max_w).get_height()+style.y_padding*2
+        return TextSurfaces.render(style.font,
+                                   text,
+                                   style.antialas,
+                                   style.color,
+                                   style.bg_color,
+                                   (self.element.relative_rect.w if style.do_wrap else 0) if not max_w else max_w).get_height()+style.y_padding*2
 
     def text_size(self, text: str) -> tuple[float, float]:
         """Return the size some text would be if rendered"""
@@ -349,6 +371,7 @@ class UITextComp(UIComponent):
         if text == self.text:
             return self
         self.text: str = text
+        self.element._clear_state_surfaces()
         self._build(self.element.style)
         return self
 
@@ -401,6 +424,7 @@ class UITextComp(UIComponent):
 
 class UIIconComp(UIComponent):
     """Element component that renders icon surfaces"""
+    style_name: str = "icon"
 
     def _init(self):
         self.icon_name = ""
@@ -423,10 +447,13 @@ class UIIconComp(UIComponent):
         if name == self.icon_name:
             return self
         self.icon_name = name
+        self.element._clear_state_surfaces()
         self._build(self.element.style)
         return self
 
     def _build(self, style: UIStyle):
+        if self.element.manager.stats.enabled:
+            self.element.manager.stats.frame["build_icon"] += 1
         icon_name = self.icon_name or style.icon.name
         self.icon_surf: pygame.Surface = pygame.transform.scale_by(
             Icons.get(icon_name, self), style.icon.scale)
@@ -448,6 +475,7 @@ class UIIconComp(UIComponent):
 
 class UIOutlineComp(UIComponent):
     """Element component that renders an outline"""
+    style_name: str = "outline"
 
     def _render(self):
         style = self.element.style
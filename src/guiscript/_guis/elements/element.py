@@ -10,8 +10,10 @@ from ..status import UIStatus
 from ..sound import UISounds
 from ..buffer import UIBuffers
 from ..tooltip import Tooltips
+from ..surfacepool import SurfacePool
 from ..animation import UIPropertyAnim
 from ..style import UIStyleGroup, UIStyles, UIStyle
+from ..script import UIScript
 from ..enums import AnimRepeatMode, AnimEaseFunc, AnimPropertyType
 from .. import components as comps
 from .. import common
@@ -32,6 +34,7 @@ class Element:
     manager -> the manager the element is bound to or optionally None if there is a current manager\n
     """
     need_event: bool = False
+    state_cacheable: bool = False
 
     def __init__(self,
                  relative_rect: pygame.Rect,
@@ -68,20 +71,27 @@ class Element:
         self.object_id: int = id(self)
         self.style_id: str = (
             UIState.current_style_id+";" if UIState.current_style_id is not None else "") + style_id
+        UIScript.retain_inline(self.style_id)
         self.element_types: tuple[str] = element_types
 
         # attrs
         self.children: list[Element] = []
+        self._sorted_children: list[Element] | None = None
         self.ghost_element: Element | None = None
         self.ghost_offset: pygame.Vector2 = pygame.Vector2()
-        self.element_surface: pygame.Surface = pygame.Surface(
-            (max(self.relative_rect.w, 1), max(self.relative_rect.h, 1)), pygame.SRCALPHA)
+        self.element_surface: pygame.Surface = SurfacePool.borrow(
+            self.relative_rect.size)
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["surface_alloc"] += 1
+        self.masked_surface: pygame.Surface | None = None
         self.absolute_rect: pygame.Rect = self.relative_rect.copy()
         self.static_rect: pygame.Rect = self.relative_rect.copy()
         self.ignore_stack: bool = False
         self.ignore_scroll: bool = False
         self.ignore_raycast: bool = False
         self.can_destroy: bool = True
+        self.flat_render: bool | None = None
+        self.state_render_cache: bool | None = None
         
         self.z_index: int = common.Z_INDEXES["element"]
         self.scroll_offset: pygame.Vector2 = pygame.Vector2()
@@ -96,6 +106,12 @@ class Element:
         self._resizers_elements: dict[str, "Element"] = {}
         self._anchor_observers: list["Element"] = []
         self._anchors: dict[str, common.UIAnchorData | None] = dict.fromkeys(("left", "right", "top", "bottom", "centerx", "centery"), None)
+        self._damaged: bool = True
+        self._last_screen_rect: pygame.Rect | None = None
+        self._last_blit_rect: pygame.Rect | None = None
+        self._redraw_rect: pygame.Rect | None = None
+        self._flat_rendered: bool = False
+        self._state_surfaces: dict[tuple, pygame.Surface] = {}
 
         # obj attrs
         self.status: UIStatus = UIStatus(self)
@@ -104,8 +120,6 @@ class Element:
         self._last_style: UIStyle = None
         self.style_group: UIStyleGroup = UIStyles.get_style_group(self)
         self.style: UIStyle = self.style_group.style
-        self.masked_surface: pygame.Surface = pygame.Surface((max(1, self.relative_rect.w-self.style.stack.mask_padding*2),
-                                                              max(1, self.relative_rect.h-self.style.stack.mask_padding*2)), pygame.SRCALPHA)
 
         # components
         self.components = ()
@@ -164,6 +178,7 @@ class Element:
     def _add_child(self, element: "Element") -> typing.Self:
         if element not in self.children:
             self.children.append(element)
+            self._sorted_children = None
             self._refresh_stack()
             self.set_dirty()
         return self
@@ -172,6 +187,7 @@ class Element:
         """Remove a child from the children, without destroying it"""
         if element in self.children:
             self.children.remove(element)
+            self._sorted_children = None
             self._refresh_stack()
             self.set_dirty()
         return self
@@ -181,6 +197,7 @@ class Element:
         for el in elements:
             if el in self.children:
                 self.children.remove(el)
+        self._sorted_children = None
         self._refresh_stack()
         self.set_dirty()
         return self
@@ -190,6 +207,7 @@ class Element:
         if not self.can_destroy and not force:
             return
         self.on_destroy()
+        self._damage_screen_rect()
         for obs in self._anchor_observers:
             obs._remove_dead_anchor(self)
         self.remove_anchors()
@@ -199,8 +217,13 @@ class Element:
         for child in list(self.children):
             child.destroy(True)
         self.children.clear()
+        self._sorted_children = None
         if self in self.manager._all_elements:
             self.manager._all_elements.remove(self)
+            UIScript.release_inline(self.style_id)
+            self._clear_state_surfaces()
+            SurfacePool.release(self.element_surface)
+            SurfacePool.release(self.masked_surface)
         if self in self.manager._event_callbacks:
             self.manager._event_callbacks.remove(self)
         del self
@@ -220,6 +243,7 @@ class Element:
             self)+places, 0, len(self.parent.children)-1)
         self.parent.children.remove(self)
         self.parent.children.insert(new_idx, self)
+        self.parent._sorted_children = None
         self.parent._refresh_stack()
         return self
     
@@ -293,6 +317,11 @@ class Element:
         """Return the current index in the parent's children"""
         return self.parent.children.index(self)
     
+    def _get_sorted_children(self) -> list["Element"]:
+        if self._sorted_children is None or len(self._sorted_children) != len(self.children):
+            self._sorted_children = sorted(self.children, key=lambda el: el.z_index)
+        return self._sorted_children
+
     def get_destroyable_children(self) -> list["Element"]:
         """Return a list with the children this element can destroy (that have the can_destroy flag set to True)"""
         return [el for el in self.children if el.can_destroy]
@@ -512,6 +541,7 @@ class Element:
         self.parent.children.remove(self)
         self.parent.children.insert(pygame.math.clamp(
             index, 0, len(self.parent.children)), self)
+        self.parent._sorted_children = None
         self.parent._refresh_stack()
         return self
 
@@ -524,10 +554,16 @@ class Element:
 
     def set_dirty(self, dirty: bool = True) -> typing.Self:
         """Change the dirty flag, usually to True. This will cause the element to re-render"""
+        if dirty:
+            self._damaged = True
+            self._damage_screen_rect()
+        return self._set_dirty_flag(dirty)
+
+    def _set_dirty_flag(self, dirty: bool) -> typing.Self:
         if dirty == self.status.dirty:
             return self
         self.status.dirty = dirty
-        self.parent.set_dirty()
+        self.parent._set_dirty_flag(True)
         return self
 
     def set_can_destroy(self, can_destroy: bool) -> typing.Self:
@@ -535,9 +571,22 @@ class Element:
         self.can_destroy = can_destroy
         return self
 
+    def set_flat_render(self, flat_render: bool | None) -> typing.Self:
+        """Set whether the element draws straight onto the parent when it has no children. If None, the manager setting is used"""
+        self.flat_render = flat_render
+        self.set_dirty()
+        return self
+
+    def set_state_render_cache(self, state_render_cache: bool | None) -> typing.Self:
+        """Set whether the element keeps its rendered surface for each style state when it has no children. If None, the manager setting is used if the element type supports it"""
+        self.state_render_cache = state_render_cache
+        self._clear_state_surfaces()
+        return self
+
     def set_z_index(self, z_index: int) -> typing.Self:
         """Set the Z index used for interaction and rendering"""
         self.z_index = z_index
+        self.parent._sorted_children = None
         self.set_dirty()
         return self
 
@@ -632,6 +681,7 @@ class Element:
         """Manually set the style group of the element (not recommended)"""
         self.style_group = style_group
         self.style = self.style_group.style
+        self._clear_state_surfaces()
         for comp in self.components:
             comp._style_changed()
         self.style_changed()
@@ -642,6 +692,8 @@ class Element:
 
     def set_style_id(self, style_id: str) -> typing.Self:
         """Set the style id of the element and build a new style group"""
+        UIScript.retain_inline(style_id)
+        UIScript.release_inline(self.style_id)
         self.style_id = style_id
         self.set_style_group(UIStyles.get_style_group(self))
         return self
@@ -655,7 +707,7 @@ class Element:
     def set_element_id(self, element_id: str) -> typing.Self:
         """Set the element id of the element and build a new style group"""
         self.element_id = element_id
-        self.set_style_group(UIStyle.get_style_group(self))
+        self.set_style_group(UIStyles.get_style_group(self))
         return self
     
     def set_parent(self, parent: typing.Union["Element", None]) -> typing.Self:
@@ -869,26 +921,52 @@ class Element:
 
     def _update_surface_size(self):
         if self.element_surface.get_size() != self.relative_rect.size:
-            self.element_surface = pygame.Surface(
-                (max(self.relative_rect.w, 1), max(self.relative_rect.h, 1)), pygame.SRCALPHA)
-            self.masked_surface: pygame.Surface = pygame.Surface((max(1, self.relative_rect.w-self.style.stack.mask_padding*2),
-                                                                  max(1, self.relative_rect.h-self.style.stack.mask_padding*2)), pygame.SRCALPHA)
+            self._clear_state_surfaces()
+            self.element_surface = SurfacePool.borrow(
+                self.relative_rect.size, self.element_surface)
+            if self.manager.stats.enabled:
+                self.manager.stats.frame["surface_alloc"] += 1
         self.set_dirty()
 
+    def _update_masked_surface(self, mask_padding: int):
+        if mask_padding <= 0:
+            if self.masked_surface is not None:
+                SurfacePool.release(self.masked_surface)
+                self.masked_surface = None
+            return
+        w, h = self.element_surface.get_size()
+        size = (max(1, w-mask_padding*2), max(1, h-mask_padding*2))
+        if self.masked_surface is None or self.masked_surface.get_size() != size:
+            self.masked_surface = SurfacePool.borrow(size, self.masked_surface)
+            if self.manager.stats.enabled:
+                self.manager.stats.frame["surface_alloc"] += 1
+
     def _update_style(self):
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["update_style"] += 1
+        changed = None if self._last_style is None else UIStyles.get_changed_components(
+            self._last_style, self.style)
+        layout = changed is None or "stack" in changed
+        size = self.relative_rect.size
         self.set_dirty()
-        self._refresh_stack()
+        if layout:
+            self._refresh_stack()
         self.style_changed()
-        self.build()
-        if not self.ignore_stack:
+        if layout:
+            self.build()
+        if not self.ignore_stack and layout:
             self.parent._refresh_stack()
         for comp in self.components:
-            comp._build(self.style)
+            if changed is None or comp.style_name is None or comp.style_name in changed:
+                comp._build(self.style)
         self.style._enter()
         self.status.invoke_callbacks(
             "on_style_change", "on_build")
-        self._update_resizers_size()
-        self._apply_anchors()
+        if layout:
+            self._update_resizers_size()
+            self._apply_anchors()
+        elif size != self.relative_rect.size and not self.ignore_stack:
+            self.parent._refresh_stack()
 
     def _update_resizers_size(self):
         for name, rel in self._resizers_elements.items():
@@ -901,6 +979,62 @@ class Element:
             else:
                 rel.set_size((self.resizers_size*2, self.resizers_size*2))
                 
+    def _damage_screen_rect(self):
+        if self.manager.track_dirty_rects and self._last_screen_rect is not None:
+            self.manager._dirty_rects.append(self._last_screen_rect)
+            self._last_screen_rect = None
+
+    def _get_screen_rect(self, local_rect: pygame.Rect | None = None) -> pygame.Rect:
+        chain: list[Element] = []
+        element = self
+        while not element.is_root():
+            chain.append(element)
+            element = element.parent
+        offset = pygame.Vector2()
+        screen_rect = element.absolute_rect.copy()
+        for element in reversed(chain):
+            offset += element.render_offset
+            screen_rect = element.absolute_rect.move(offset).clip(screen_rect)
+        if local_rect is not None:
+            return local_rect.move(self.absolute_rect.topleft+offset).clip(screen_rect)
+        return screen_rect
+
+    def _get_blit_rect(self) -> pygame.Rect:
+        return self.element_surface.get_rect(topleft=self.relative_rect.topleft -
+                                             (self.manager.root.scroll_offset if self.ignore_scroll else self.parent.scroll_offset)+self.render_offset)
+
+    def _get_redraw_rect(self) -> pygame.Rect:
+        surface_rect = self.element_surface.get_rect()
+        redraw_rect = pygame.Rect(0, 0, 0, 0)
+        for child in self.children:
+            old_rect = child._last_blit_rect
+            new_rect = child._get_blit_rect() if child.status.visible else None
+            child._last_blit_rect = new_rect
+            if not child.status.dirty and old_rect == new_rect:
+                continue
+            rects = (old_rect, new_rect)
+            if new_rect is not None and old_rect == new_rect and not child._damaged:
+                # the child will only redraw part of itself
+                child._redraw_rect = child._get_redraw_rect()
+                rects = (child._redraw_rect.move(new_rect.topleft),)
+            for rect in rects:
+                if rect is None:
+                    continue
+                rect = rect.clip(surface_rect)
+                if rect.w <= 0 or rect.h <= 0:
+                    continue
+                redraw_rect = rect if redraw_rect.w <= 0 else redraw_rect.union(rect)
+        return redraw_rect
+
+    def _compose_child(self, child: "Element", position: pygame.Vector2, rerendered: bool):
+        self.element_surface.blit(child.element_surface, position)
+
+    def _track_rendered_rect(self):
+        if self.manager.track_dirty_rects:
+            self._last_screen_rect = self._get_screen_rect()
+            self.manager._dirty_rects.append(self._last_screen_rect)
+        self._damaged = False
+
     def _remove_dead_anchor(self, dead_element: "Element"):
         for an, ad in list(self._anchors.items()):
             if ad is not None and ad.target is dead_element:
@@ -966,10 +1100,12 @@ class Element:
     def _logic(self):
         if not self.status.visible:
             return
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["logic"] += 1
         if self.ghost_element is not None:
             self.set_relative_pos((self.ghost_element.relative_rect.centerx-self.relative_rect.w // 2+self.ghost_offset.x,
                                    self.ghost_element.relative_rect.centery-self.relative_rect.h//2+self.ghost_offset.y))
-        for child in sorted(self.children, key=lambda el: el.z_index):
+        for child in self._get_sorted_children():
             child._logic()
             
         style: UIStyle = None
@@ -988,13 +1124,22 @@ class Element:
         
         self.style._logic()
         if self.style.dirty:
+            self._clear_state_surfaces()
             for comp in self.components:
                 comp._build(self.style)
             self.style.dirty = False
+            self.style.dirty_components.clear()
             self.set_dirty()
             self.style_changed()
             self.build()
             self.status.invoke_callbacks("on_style_change", "on_build")
+        elif len(self.style.dirty_components) > 0:
+            self._clear_state_surfaces()
+            for comp in self.components:
+                if comp.style_name is None or comp.style_name in self.style.dirty_components:
+                    comp._build(self.style)
+            self.style.dirty_components.clear()
+            self.set_dirty()
             
         if len(self._resizers_elements) > 0 and UIState.mouse_rel.length() > 0:
             for name, rel in self._resizers_elements.items():
@@ -1050,8 +1195,44 @@ class Element:
                 child._render(fake=True)
             return
 
-        if self.status.dirty:
+        if self._can_flat_render(parent_mask_padding):
+            self._flat_render(parent_mask_padding)
+            return
+        if self._flat_rendered:
+            # the own surface was skipped and is outdated
+            self._flat_rendered = False
+            self._damaged = True
+            self.status.dirty = True
+
+        rerendered = self.status.dirty
+        state_key = self._get_state_key() if self.status.dirty else None
+        state_surface = self._state_surfaces.get(state_key, None) if state_key is not None else None
+        if state_surface is not None:
+            if self.manager.stats.enabled:
+                self.manager.stats.frame["render_cached"] += 1
+            self._use_state_surface(state_surface)
+        elif self.status.dirty:
+            if self.manager.stats.enabled:
+                self.manager.stats.frame["render"] += 1
+            self._detach_state_surface()
+            if state_key is not None:
+                # the whole surface is kept for the state
+                self._damaged = True
             mask_padding = self.style.stack.mask_padding
+            self._update_masked_surface(mask_padding)
+            redraw_rect = self._redraw_rect if self._redraw_rect is not None else self._get_redraw_rect()
+            self._redraw_rect = None
+            if self._damaged:
+                self._track_rendered_rect()
+            else:
+                # only children changed, redraw the area they cover
+                if self.manager.track_dirty_rects and redraw_rect.w > 0:
+                    self.manager._dirty_rects.append(
+                        self._get_screen_rect(redraw_rect))
+                self.element_surface.set_clip(redraw_rect)
+                if mask_padding > 0:
+                    self.masked_surface.set_clip(
+                        redraw_rect.move(-mask_padding, -mask_padding))
             self.manager._last_rendered = self
             self.element_surface.fill(0)
             if mask_padding > 0:
@@ -1059,7 +1240,7 @@ class Element:
 
             for i, comp in enumerate(self.components):
                 if i == len(self.components)-1:
-                    for child in sorted(self.children, key=lambda el: el.z_index):
+                    for child in self._get_sorted_children():
                         child._render(mask_padding, True)
                     if mask_padding > 0:
                         self.element_surface.blit(
@@ -1068,15 +1249,85 @@ class Element:
                     comp._render()
 
             self.on_render()
+            self.element_surface.set_clip(None)
+            if mask_padding > 0:
+                self.masked_surface.set_clip(None)
+            if state_key is not None:
+                self._state_surfaces[state_key] = self.element_surface
         else:
             self.manager._last_rendered = self
             for child in self.children:
                 child._render(fake=True)
         if parent_mask_padding <= 0:
-            self.parent.element_surface.blit(self.element_surface, self.relative_rect.topleft -
-                                             (self.manager.root.scroll_offset if self.ignore_scroll else self.parent.scroll_offset)+self.render_offset)
+            self.parent._compose_child(self, self.relative_rect.topleft -
+                                       (self.manager.root.scroll_offset if self.ignore_scroll else self.parent.scroll_offset)+self.render_offset, rerendered)
         else:
             self.parent.masked_surface.blit(self.element_surface, self.relative_rect.topleft -
                                             (pygame.Vector2(parent_mask_padding, parent_mask_padding)) -
                                             (self.manager.root.scroll_offset if self.ignore_scroll else self.parent.scroll_offset)+self.render_offset)
         self.status.dirty = False
+
+    def _get_state_key(self) -> tuple | None:
+        state_render_cache = self.state_render_cache
+        if state_render_cache is None:
+            state_render_cache = self.state_cacheable and self.manager.state_render_cache
+        if not state_render_cache or len(self.children) > 0 or self.style.stack.mask_padding > 0:
+            return None
+        if self.text._show_cursor or len(self.text.selection_rects) > 0:
+            return None
+        return (self.style, self.relative_rect.size, self.manager.navigation.tabbed_element is self)
+
+    def _is_state_surface(self, surface: pygame.Surface) -> bool:
+        return any(cached is surface for cached in self._state_surfaces.values())
+
+    def _use_state_surface(self, surface: pygame.Surface):
+        if not self._is_state_surface(self.element_surface):
+            SurfacePool.release(self.element_surface)
+        self.element_surface = surface
+        self._track_rendered_rect()
+        self._redraw_rect = None
+        self.manager._last_rendered = self
+
+    def _detach_state_surface(self):
+        if len(self._state_surfaces) > 0 and self._is_state_surface(self.element_surface):
+            # the cached surface of the previous state must not be drawn over
+            self.element_surface = SurfacePool.borrow(self.relative_rect.size)
+            if self.manager.stats.enabled:
+                self.manager.stats.frame["surface_alloc"] += 1
+            self._damaged = True
+
+    def _clear_state_surfaces(self):
+        if len(self._state_surfaces) <= 0:
+            return
+        for surface in self._state_surfaces.values():
+            if surface is not self.element_surface:
+                SurfacePool.release(surface)
+        self._state_surfaces.clear()
+
+    def _can_flat_render(self, parent_mask_padding: int) -> bool:
+        flat_render = self.flat_render if self.flat_render is not None else self.manager.flat_render
+        if not flat_render or len(self.children) > 0 or self.parent.is_root():
+            return False
+        target = self.parent.masked_surface if parent_mask_padding > 0 else self.parent.element_surface
+        return target.get_rect().contains(self._get_blit_rect().move(-parent_mask_padding, -parent_mask_padding))
+
+    def _flat_render(self, parent_mask_padding: int):
+        if self._damaged:
+            self._track_rendered_rect()
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["render"] += 1
+        self.manager._last_rendered = self
+        target = self.parent.masked_surface if parent_mask_padding > 0 else self.parent.element_surface
+        blit_rect = self._get_blit_rect().move(-parent_mask_padding, -parent_mask_padding)
+        clip_rect = target.get_clip().clip(blit_rect)
+        if clip_rect.w > 0 and clip_rect.h > 0:
+            own_surface = self.element_surface
+            self.element_surface = target.subsurface(blit_rect)
+            self.element_surface.set_clip(clip_rect.move(-blit_rect.x, -blit_rect.y))
+            for comp in self.components:
+                if comp.enabled:
+                    comp._render()
+            self.on_render()
+            self.element_surface = own_surface
+        self._flat_rendered = True
+        self.status.dirty = False
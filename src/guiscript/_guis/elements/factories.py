@@ -455,6 +455,7 @@ class Image(Element):
 
 class Button(Element):
     """Active element with a shortcut to set and get the text"""
+    state_cacheable = True
 
     def __init__(self,
                  text: str,
@@ -482,6 +483,7 @@ class Button(Element):
 
 class ImageButton(Element):
     """Active element with a shortcut to set and get the image"""
+    state_cacheable = True
 
     def __init__(self,
                  surface: pygame.Surface,
@@ -513,6 +515,7 @@ class ImageButton(Element):
 
 class IconButton(Element):
     """Active element with a shortcut to set and get the icon"""
+    state_cacheable = True
 
     def __init__(self,
                  name: str | None,
@@ -541,6 +544,7 @@ class IconButton(Element):
 
 class Checkbox(Element):
     """Selectable element with shortcuts for selection and deselection"""
+    state_cacheable = True
 
     def __init__(self,
                  relative_rect: pygame.Rect,
@@ -2,6 +2,7 @@ import pygame
 import typing
 
 from ..error import UIError
+from ..backends import RenderBackend, SurfaceBackend
 from .element import Element
 
 
@@ -20,19 +21,25 @@ class UIRoot:
         self.status: UIRoot.UIRootStatus = UIRoot.UIRootStatus()
         self.scroll_offset = pygame.Vector2()
         self.children: list[Element] = []
+        self._sorted_children: list[Element] | None = None
         self.ignore_raycast: bool = False
+        self.render_backend: RenderBackend = SurfaceBackend()
 
     def _refresh_stack(self):
         ...
 
     def _add_child(self, element: Element) -> typing.Self:
         self.children.append(element)
+        self._sorted_children = None
         return self
 
     def remove_child(self, element: Element) -> typing.Self:
         """Remove a child from the children, without destroying it"""
         if element in self.children:
             self.children.remove(element)
+            self._sorted_children = None
+            self.render_backend._forget(element)
+            element._damage_screen_rect()
         return self
 
     def set_screen_surface(self, screen_surface: pygame.Surface) -> typing.Self:
@@ -48,6 +55,9 @@ class UIRoot:
         """Empty"""
         ...
 
+    def _set_dirty_flag(self, dirty: bool):
+        ...
+
     def __enter__(self):
         raise UIError(
             f"Cannot use context manager with UIRoot, it's alrady the default element parent")
@@ -55,12 +65,20 @@ class UIRoot:
     def _first_frame(self):
         ...
 
+    def _get_sorted_children(self) -> list[Element]:
+        if self._sorted_children is None or len(self._sorted_children) != len(self.children):
+            self._sorted_children = sorted(self.children, key=lambda el: el.z_index)
+        return self._sorted_children
+
+    def _compose_child(self, child: Element, position: pygame.Vector2, rerendered: bool):
+        self.render_backend._compose(self, child, position, rerendered)
+
     def _logic(self):
         for child in self.children:
             child._logic()
 
     def _render(self):
-        for child in sorted(self.children, key=lambda el: el.z_index):
+        for child in self._get_sorted_children():
             child._render(0, True)
 
     def get_absolute_topleft(self) -> pygame.Vector2:
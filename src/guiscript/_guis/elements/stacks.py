@@ -96,6 +96,8 @@ class VStack(UIStack):
     def _refresh_stack(self):
         if not self.manager._running or not self._done:
             return
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["refresh_stack"] += 1
 
         style = self.style
         total_x = 0
@@ -252,6 +254,8 @@ class HStack(UIStack):
     def _refresh_stack(self):
         if not self.manager._running or not self._done:
             return
+        if self.manager.stats.enabled:
+            self.manager.stats.frame["refresh_stack"] += 1
         style = self.style
         total_x = style.stack.padding
         total_y = 0
@@ -66,15 +66,21 @@ FILEDIALOG_HOME = pygame.event.custom_type()
 COLORPICKER_CHANGE = pygame.event.custom_type()
 
 
+def _post(element: "Element", event: pygame.Event):
+    if element.manager.stats.enabled:
+        element.manager.stats.frame["events"] += 1
+    pygame.event.post(event)
+
+
 def _post_base_event(type_: int, element: "Element"):
-    pygame.event.post(pygame.Event(type_, {
+    _post(element, pygame.Event(type_, {
         "id": element.element_id,
         "element": element,
     }))
 
 
 def _post_slideshow_event(mode: str, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         SLIDESHOW_MOVE_LEFT if mode == "left" else SLIDESHOW_MOVE_RIGHT,
         {
             "id": element.element_id,
@@ -85,7 +91,7 @@ def _post_slideshow_event(mode: str, element: "Element"):
 
 
 def _post_slider_event(old: float, new: float, element: "Element"):
-    pygame.event.post(pygame.Event(SLIDER_MOVE, {
+    _post(element, pygame.Event(SLIDER_MOVE, {
         "id": element.element_id,
         "element": element,
         "slider": element,
@@ -97,7 +103,7 @@ def _post_slider_event(old: float, new: float, element: "Element"):
 
 
 def _post_sound_player_event(type_: int, element: "Element"):
-    pygame.event.post(pygame.Event(type_, {
+    _post(element, pygame.Event(type_, {
         "id": element.element_id,
         "element": element,
         "soundplayer": element,
@@ -111,7 +117,7 @@ def _post_sound_player_event(type_: int, element: "Element"):
 
 
 def _post_video_player_event(type_: int, element: "Element"):
-    pygame.event.post(pygame.Event(type_, {
+    _post(element, pygame.Event(type_, {
         "id": element.element_id,
         "element": element,
         "videoplayer": element,
@@ -125,7 +131,7 @@ def _post_video_player_event(type_: int, element: "Element"):
 
 
 def _post_dropmenu_event(mode: str, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         DROPMENU_SELECT if mode == "select" else DROPMENU_TOGGLE,
         {
             "id": element.element_id,
@@ -137,7 +143,7 @@ def _post_dropmenu_event(mode: str, element: "Element"):
 
 
 def _post_selectionlist_event(mode: str, element: "Element", option: str):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         SELECTIONLIST_SELECT if mode == "select" else SELECTIONLIST_DESELECT,
         {
             "id": element.element_id,
@@ -149,7 +155,7 @@ def _post_selectionlist_event(mode: str, element: "Element", option: str):
 
 
 def _post_animation_event(animation):
-    pygame.event.post(pygame.Event(
+    _post(animation.element, pygame.Event(
         ANIMATION_END,
         {
             "animation": animation,
@@ -159,7 +165,7 @@ def _post_animation_event(animation):
     
 
 def _post_entry_event(mode:str, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         ENTRY_CHANGE if mode == "change" else ENTRY_FOCUS if mode == "focus" else ENTRY_UNFOCUS,
         {
             "id": element.element_id,
@@ -170,7 +176,7 @@ def _post_entry_event(mode:str, element: "Element"):
     ))
     
 def _post_textbox_event(mode:str, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         TEXTBOX_CHANGE if mode == "change" else TEXTBOX_FOCUS if mode == "focus" else TEXTBOX_UNFOCUS,
         {
             "id": element.element_id,
@@ -182,7 +188,7 @@ def _post_textbox_event(mode:str, element: "Element"):
     
     
 def _post_window_event(mode: str, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         WINDOW_CLOSE if mode == "close" else WINDOW_DRAG if mode == "drag" else WINDOW_COLLAPSE,
         {
             "id": element.element_id,
@@ -194,7 +200,7 @@ def _post_window_event(mode: str, element: "Element"):
 
 
 def _post_filedialog_event(type: int, element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         type,
         {
             "id": element.element_id,
@@ -207,7 +213,7 @@ def _post_filedialog_event(type: int, element: "Element"):
     
 
 def _post_colorpicker_event(element: "Element"):
-    pygame.event.post(pygame.Event(
+    _post(element, pygame.Event(
         COLORPICKER_CHANGE,
         {
             "id": element.element_id,
@@ -0,0 +1,54 @@
+import pygame
+import typing
+import pathlib
+import collections
+
+GOOGLEICONS_PATH: str = str(pathlib.Path(__file__).parent) + "/googleiconsfontttf.py"
+
+
+class Fonts:
+    """
+    Font manager that shares the font objects of the styles and the rich text, evicting the least recently used\n
+    Fonts requested with modifiers (align, bold, italic, underline, strikethrough) are created with them and must not be modified,
+    fonts requested without modifiers are left to callers that set them before every use
+    """
+    max_fonts: int = 128
+    fonts: collections.OrderedDict[tuple, pygame.Font] = collections.OrderedDict()
+
+    @classmethod
+    def set_max_fonts(cls, max_fonts: int) -> typing.Self:
+        """Set how many font objects are kept before evicting the least recently used"""
+        cls.max_fonts = max(1, int(max_fonts))
+        while len(cls.fonts) > cls.max_fonts:
+            cls.fonts.popitem(False)
+        return cls
+
+    @classmethod
+    def clear(cls) -> typing.Self:
+        """Release the cached fonts. Elements keep their current font until it's rebuilt"""
+        cls.fonts.clear()
+        return cls
+
+    @classmethod
+    def get(cls, font_name: str | None, font_size: int, sysfont: bool = True, modifiers: tuple[int, bool, bool, bool, bool] | None = None) -> pygame.Font:
+        """Return a cached font. Modifiers are align, bold, italic, underline and strikethrough"""
+        key = (font_name, int(font_size), bool(sysfont), modifiers)
+        font = cls.fonts.get(key, None)
+        if font is not None:
+            cls.fonts.move_to_end(key)
+            return font
+        font = cls._load(font_name, int(font_size), sysfont)
+        if modifiers is not None:
+            font.align, font.bold, font.italic, font.underline, font.strikethrough = modifiers
+        cls.fonts[key] = font
+        if len(cls.fonts) > cls.max_fonts:
+            cls.fonts.popitem(False)
+        return font
+
+    @classmethod
+    def _load(cls, font_name: str | None, font_size: int, sysfont: bool) -> pygame.Font:
+        if font_name == "googleicons":
+            return pygame.Font(GOOGLEICONS_PATH, font_size)
+        if sysfont:
+            return pygame.font.SysFont(font_name, font_size)
+        return pygame.Font(font_name, font_size)
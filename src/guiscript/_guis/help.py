@@ -517,4 +517,6 @@ def help_rich_text() -> typing.LiteralString:
     - <f / font name=FontName> -> font name, where FontName is a string
     - <c / color fg=ColorValue> -> fg color, where ColorValue is a value supported by pygame
     - <c / color bg=ColorValue> -> bg color, where ColorValue is a value supported by pygame
+    Colors can be names, hex strings ('#ff0000') or numbers ('(255, 0, 0)'). Parsed texts are remembered, so setting the same text again doesn't parse it.
+    Characters sharing the same tags are rendered together and wrapped lines break between words.
     """
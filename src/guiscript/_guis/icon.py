@@ -4,6 +4,7 @@ import warnings
 import requests
 import threading
 import io
+from .images import Images
 if typing.TYPE_CHECKING:
     from .components import UIIconComp
 
@@ -30,6 +31,7 @@ class Icons:
     icons: dict[str, pygame.Surface] = {
         "empty": _empty
     }
+    icon_paths: dict[str, str] = {}
     rebuild_async: list["UIIconComp"] = []
     adding_async: list[str] = []
 
@@ -62,6 +64,11 @@ class Icons:
         """Bind a surface icon to a name"""
         cls.icons[name] = surface
 
+    @classmethod
+    def add_path(cls, name: str, path: str):
+        """Bind an image file to an icon name, loading it the first time the icon is used"""
+        cls.icon_paths[name] = path
+
     @classmethod
     def adds(cls, **name_surfs: pygame.Surface):
         """Bind surfaces to icon names"""
@@ -77,6 +84,8 @@ class Icons:
             cls.rebuild_async.append(icon_comp)
             return cls.icons["empty"]
         surf = cls.icons.get(name, None)
+        if not surf and name in cls.icon_paths:
+            surf = cls.icons[name] = Images.get(cls.icon_paths.pop(name))
         if not surf:
             warnings.warn(
                 f"No icon '{name}' was added, returing default", category=UserWarning)
@@ -0,0 +1,62 @@
+import pygame
+import typing
+import os
+from concurrent import futures
+
+
+class Images:
+    """Image manager that loads each image file of the style scripts once, the first time it's used, optionally decoding it in a background thread"""
+    images: dict[str, pygame.Surface] = {}
+    pending: dict[str, futures.Future] = {}
+    background_loading: bool = False
+    max_workers: int = 2
+    _executor: futures.ThreadPoolExecutor | None = None
+
+    @classmethod
+    def set_background_loading(cls, background_loading: bool) -> typing.Self:
+        """Set whether the images referenced by style scripts start decoding in a background thread as soon as they are parsed"""
+        cls.background_loading = background_loading
+        return cls
+
+    @classmethod
+    def get_key(cls, path: str) -> str:
+        """Return the normalized path images are cached with"""
+        return os.path.normcase(os.path.abspath(path))
+
+    @classmethod
+    def get(cls, path: str) -> pygame.Surface:
+        """Return the image at the given path, loading it the first time. If it's decoding in the background, wait for it"""
+        key = cls.get_key(path)
+        image = cls.images.get(key, None)
+        if image is None:
+            future = cls.pending.pop(key, None)
+            image = future.result() if future is not None else pygame.image.load(key)
+            image = cls.images[key] = image.convert_alpha()
+        return image
+
+    @classmethod
+    def preload(cls, *paths: str) -> typing.Self:
+        """Start decoding the images at the given paths in a background thread"""
+        for path in paths:
+            key = cls.get_key(path)
+            if key in cls.images or key in cls.pending:
+                continue
+            if cls._executor is None:
+                cls._executor = futures.ThreadPoolExecutor(
+                    cls.max_workers, "guiscript-images")
+            cls.pending[key] = cls._executor.submit(pygame.image.load, key)
+        return cls
+
+    @classmethod
+    def is_loaded(cls, path: str) -> bool:
+        """Return whether the image at the given path was already loaded"""
+        return cls.get_key(path) in cls.images
+
+    @classmethod
+    def clear(cls) -> typing.Self:
+        """Forget the loaded images. Elements keep the ones they already use"""
+        cls.images.clear()
+        for future in cls.pending.values():
+            future.cancel()
+        cls.pending.clear()
+        return cls
@@ -195,7 +195,7 @@ class UIInteract:
         if (not start_parent.absolute_rect.collidepoint(position) or start_parent.ignore_raycast) and can_recurse_above:
             return self.raycast(position, start_parent.parent, True)
 
-        for rev_child in reversed(sorted(start_parent.children, key=lambda el: el.z_index)):
+        for rev_child in reversed(start_parent._get_sorted_children()):
             if not rev_child.absolute_rect.collidepoint(position) or not rev_child.status.visible or rev_child.ignore_raycast:
                 continue
             if len(rev_child.children) > 0:
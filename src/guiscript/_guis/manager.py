@@ -1,13 +1,19 @@
 import pygame
 import typing
+import time
+import gc
 
 from .state import UIState
+from .error import UIError, UIScriptError
 from .elements.root import UIRoot
 from .interact import UIInteract
 from .navigation import UINavigation
 from .elements.element import Element
 from .script import UIScript
+from .style import UIStyles
 from .cursors import UICursors
+from .backends import RenderBackend
+from .stats import UIStats
 from . import common
 
 
@@ -16,6 +22,18 @@ class Manager:
     Manager of ui elements bound to it. A UIRoot is created automatically as well as interaction and keyboard navigation
 
     All paths provided by the gss_path argument and all sources provided by the gss_sources will be executed using gss_variables as variables
+
+    If track_dirty_rects is True, render() will return the list of screen rects that changed, to pass to pygame.display.update
+
+    If flat_render is True, leaf elements fully inside their parent draw straight onto it instead of using their own surface (elements can override it)
+
+    If state_render_cache is True, buttons and checkboxes keep their rendered surface for each style state and reuse it when hovered or pressed again (elements can override it)
+
+    If gss_hot_reload is True, the loaded GSS files are checked for changes during logic and only the elements matching the changed styles are restyled
+
+    If gss_cache_dir is provided, parsed GSS sources are cached in that directory and reused by the next runs
+
+    The styles loaded by a manager only apply to its elements, unless they are loaded as shared. Named themes are compiled once with add_theme and swapped with set_theme
     """
 
     def __init__(self,
@@ -24,25 +42,47 @@ class Manager:
                  gss_paths: list[str] | None = None,
                  gss_sources: list[str] | None = None,
                  gss_variables: dict[str] | None = None,
+                 track_dirty_rects: bool = False,
+                 flat_render: bool = False,
+                 state_render_cache: bool = False,
+                 gss_hot_reload: bool = False,
+                 gss_cache_dir: str | None = None
                  ):
         self.gss_variables = gss_variables
         if gss_variables is None:
             self.gss_variables: dict[str] = {}
 
+        self.style_scope: int = UIState.num_managers
+        self.style_scopes: tuple[int | str, ...] = (self.style_scope,)
+        self.themes: dict[str, str] = {}
+        self.theme: str | None = None
+        if gss_cache_dir is not None:
+            UIScript.set_cache_dir(gss_cache_dir)
         UIScript.parse_source(common.DEFAULT_STYLE_GSS, "default.gss", {
             "DARK_COLOR": (12, 12, 12)
         })
         if gss_paths is not None:
             for gss_path in gss_paths:
-                UIScript.parse_script(gss_path, self.gss_variables)
+                UIScript.parse_script(
+                    gss_path, self.gss_variables, self.style_scope)
         if gss_sources is not None:
             for i, gss_source in enumerate(gss_sources):
-                UIScript.parse_source(gss_source, f"gss.source.idx:{UIState.num_managers},{i}", self.gss_variables)
+                UIScript.parse_source(gss_source, f"gss.source.idx:{UIState.num_managers},{i}", self.gss_variables, self.style_scope)
 
+        self.track_dirty_rects: bool = track_dirty_rects
+        self.flat_render: bool = flat_render
+        self.state_render_cache: bool = state_render_cache
+        self.gss_hot_reload: bool = gss_hot_reload
+        self.gss_reload_interval: int = 500
+        self._last_gss_check: int = 0
+        self._gss_reloads_applied: int = len(UIScript.reloads)
+        self._dirty_rects: list[pygame.Rect] = []
+        self._full_damage: bool = True
         self._running: bool = False
         self._all_elements: list[Element] = []
         self._last_rendered: Element = None
         self._event_callbacks: list[Element] = []
+        self.stats: UIStats = UIStats(self)
         self.cursors: UICursors = UICursors(self)
         self.interact: UIInteract = UIInteract(self)
         self.navigation: UINavigation = UINavigation(self)
@@ -68,6 +108,7 @@ class Manager:
     def set_screen_surface(self, screen_surface: pygame.Surface) -> typing.Self:
         """Set the screen surface to draw on"""
         self.root.set_screen_surface(screen_surface)
+        self._full_damage = True
         return self
 
     def _running_check(self):
@@ -78,6 +119,8 @@ class Manager:
 
     def event(self, event: pygame.Event) -> typing.Self:
         """Pass events to elements and to interaction and keyboard navigation"""
+        if self.stats.enabled:
+            start = time.perf_counter()
         self._running_check()
         if event.type == pygame.MOUSEWHEEL:
             UIState.mouse_wheel = pygame.Vector2(event.x, event.y)
@@ -89,22 +132,111 @@ class Manager:
             el.on_event(event)
         self.interact._event(event)
         self.navigation._event(event)
+        if self.stats.enabled:
+            self.stats.frame["event_ms"] += (time.perf_counter()-start)*1000
         return self
 
     def logic(self) -> typing.Self:
         """Update elements and their status"""
+        if self.stats.enabled:
+            start = time.perf_counter()
         self._running_check()
+        if self.gss_hot_reload and pygame.time.get_ticks()-self._last_gss_check >= self.gss_reload_interval:
+            self.reload_gss()
         self.interact._logic()
         self.root._logic()
+        if self.stats.enabled:
+            self.stats.frame["logic_ms"] += (time.perf_counter()-start)*1000
         return self
 
-    def render(self) -> typing.Self:
-        """Render all elements to the screen surface"""
+    def render(self) -> typing.Self | list[pygame.Rect]:
+        """Render all elements to the screen surface. If dirty rects are tracked, return the screen rects that changed this frame instead"""
+        if self.stats.enabled:
+            start = time.perf_counter()
         self._running_check()
         self.root._render()
         UIState.mouse_wheel = pygame.Vector2()
+        if self.stats.enabled:
+            self.stats.frame["render_ms"] += (time.perf_counter()-start)*1000
+            self.stats._end_frame()
+        if self.track_dirty_rects:
+            return self._pop_dirty_rects()
+        return self
+
+    def set_track_dirty_rects(self, track_dirty_rects: bool) -> typing.Self:
+        """Set whether render() should return the changed screen rects. All elements will re-render on the next frame"""
+        self.track_dirty_rects = track_dirty_rects
+        self._dirty_rects = []
+        self._full_damage = True
+        for el in self._all_elements:
+            el.set_dirty()
+        return self
+
+    def set_render_backend(self, render_backend: RenderBackend) -> typing.Self:
+        """Set the backend used to compose the top level elements on the screen (SurfaceBackend by default). All elements will re-render on the next frame"""
+        self.root.render_backend.clear()
+        self.root.render_backend = render_backend
+        self._full_damage = True
+        for el in self._all_elements:
+            el.set_dirty()
+        return self
+
+    def set_flat_render(self, flat_render: bool) -> typing.Self:
+        """Set whether leaf elements draw straight onto their parent by default. All elements will re-render on the next frame"""
+        self.flat_render = flat_render
+        for el in self._all_elements:
+            el.set_dirty()
+        return self
+
+    def set_state_render_cache(self, state_render_cache: bool) -> typing.Self:
+        """Set whether buttons and checkboxes keep their rendered surface for each style state by default. The kept surfaces are released"""
+        self.state_render_cache = state_render_cache
+        for el in self._all_elements:
+            el._clear_state_surfaces()
+        return self
+
+    def set_gss_hot_reload(self, gss_hot_reload: bool, interval_ms: int = 500) -> typing.Self:
+        """Set whether the loaded GSS files are checked for changes every interval_ms milliseconds during logic"""
+        self.gss_hot_reload = gss_hot_reload
+        self.gss_reload_interval = interval_ms
+        return self
+
+    def reload_gss(self) -> typing.Self:
+        """Reload the modified shared GSS files and the ones of this manager and restyle only the elements matching the changed styles"""
+        self._last_gss_check = pygame.time.get_ticks()
+        UIScript.reload_changed(self.gss_variables, self._get_owned_scopes())
+        selectors = set().union(*UIScript.reloads[self._gss_reloads_applied:])
+        self._gss_reloads_applied = len(UIScript.reloads)
+        if len(selectors) > 0:
+            self._restyle(selectors)
         return self
 
+    def _restyle(self, selectors: set[tuple[str, str]]):
+        element_types = {target_id for target, target_id in selectors if target == "element_type"}
+        style_ids = {target_id for target, target_id in selectors if target == "style_id"}
+        element_ids = {target_id for target, target_id in selectors if target == "element_id"}
+        for element in list(self._all_elements):
+            if (element_types.intersection(element.element_types)
+                    or style_ids.intersection(element.style_id.replace(" ", "").replace(",", ";").split(";"))
+                    or element.element_id.strip() in element_ids):
+                element.set_style_group(UIStyles.get_style_group(element))
+
+    def _pop_dirty_rects(self) -> list[pygame.Rect]:
+        if self._full_damage:
+            self._full_damage = False
+            self._dirty_rects = []
+            return [self.root.absolute_rect.copy()]
+        rects: list[pygame.Rect] = []
+        for rect in self._dirty_rects:
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            if any(kept.contains(rect) for kept in rects):
+                continue
+            rects = [kept for kept in rects if not rect.contains(kept)]
+            rects.append(rect)
+        self._dirty_rects = []
+        return rects
+
     def set_current(self) -> typing.Self:
         """Set this manager as the current. All elements created after this call will use this as their manager, unless a different one is specified"""
         UIState.current_manager = self
@@ -115,21 +247,96 @@ class Manager:
         return self is UIState.current_manager
 
     def set_gss_vars(self, **names_values) -> typing.Self:
-        """Update the variables used to execute style scripts"""
+        """Update the variables used to execute style scripts. The style values using the changed variables are computed again and the elements using them restyled"""
+        changed = set()
+        old_variables = self.gss_variables.copy()
         for name, val in names_values.items():
+            if name not in self.gss_variables or self.gss_variables[name] != val:
+                changed.add(name)
             self.gss_variables[name] = val
+        if len(changed) > 0:
+            try:
+                selectors = UIScript.update_variables(
+                    self.gss_variables, changed, self._get_owned_scopes())
+            except UIScriptError:
+                self.gss_variables.clear()
+                self.gss_variables.update(old_variables)
+                raise
+            if len(selectors) > 0:
+                self._restyle(selectors)
         return self
 
-    def load_gss_script(self, filepath: str) -> typing.Self:
-        """Execute a style script from a file"""
-        UIScript.parse_script(filepath, self.gss_variables)
+    def load_gss_script(self, filepath: str, shared: bool = False) -> typing.Self:
+        """Execute a style script from a file. If shared is True, the styles apply to the elements of every manager"""
+        UIScript.parse_script(filepath, self.gss_variables,
+                              None if shared else self.style_scope)
         return self
 
-    def load_gss_source(self, source: str, debug_filename: str) -> typing.Self:
-        """Execute a style script from a string"""
-        UIScript.parse_source(source, debug_filename, self.gss_variables)
+    def load_gss_source(self, source: str, debug_filename: str, shared: bool = False) -> typing.Self:
+        """Execute a style script from a string. If shared is True, the styles apply to the elements of every manager"""
+        UIScript.parse_source(source, debug_filename, self.gss_variables,
+                              None if shared else self.style_scope)
         return self
 
+    def unload_gss(self) -> typing.Self:
+        """Remove the styles loaded by this manager (not the shared ones) and restyle its elements"""
+        UIScript.unload_scope(self.style_scope)
+        self._restyle_all()
+        return self
+
+    def add_theme(self, name: str, gss_paths: list[str] | None = None, gss_sources: list[str] | None = None) -> typing.Self:
+        """Compile a named theme from GSS files and sources, applied over the manager styles when it's set with set_theme. An existing theme with the same name is replaced"""
+        scope = f"{self.style_scope}.theme.{name}"
+        if name in self.themes:
+            UIScript.unload_scope(scope)
+        self.themes[name] = scope
+        if gss_paths is not None:
+            for gss_path in gss_paths:
+                UIScript.parse_script(gss_path, self.gss_variables, scope)
+        if gss_sources is not None:
+            for i, gss_source in enumerate(gss_sources):
+                UIScript.parse_source(
+                    gss_source, f"gss.theme.{name}.idx:{i}", self.gss_variables, scope)
+        if self.theme == name:
+            self._restyle_all()
+        return self
+
+    def set_theme(self, name: str | None) -> typing.Self:
+        """Set the active theme, restyling all elements with the precompiled styles. None only uses the manager styles"""
+        if name is not None and name not in self.themes:
+            raise UIError(
+                f"Theme '{name}' doesn't exist. Available themes are {list(self.themes.keys())}")
+        if name == self.theme:
+            return self
+        self.theme = name
+        self.style_scopes = (self.style_scope,) if name is None else (
+            self.style_scope, self.themes[name])
+        self._restyle_all()
+        return self
+
+    def remove_theme(self, name: str) -> typing.Self:
+        """Remove a theme, setting no theme if it was active"""
+        if name not in self.themes:
+            return self
+        if self.theme == name:
+            self.set_theme(None)
+        UIScript.unload_scope(self.themes.pop(name))
+        return self
+
+    def _get_owned_scopes(self) -> tuple[int | str, ...]:
+        return (self.style_scope, *self.themes.values())
+
+    def _restyle_all(self):
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for element in list(self._all_elements):
+                if not UIStyles.is_style_group_current(element):
+                    element.set_style_group(UIStyles.get_style_group(element))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
     def get_with_element_id(self, element_id: str) -> Element | None:
         """Return the element with the given id"""
         for el in self._all_elements:
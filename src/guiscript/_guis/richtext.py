@@ -1,6 +1,12 @@
 import pygame
+import re
+import html
+import bisect
+import collections
 from enum import StrEnum
-from html import parser as html_parser
+
+from .fonts import Fonts
+from .error import UIError
 
 
 class ModifierName(StrEnum):
@@ -36,16 +42,81 @@ def modifiers_of_char(char_i: int, modifiers, default_modifiers, start_i: int):
     }
 
 
-class RichTextParser(html_parser.HTMLParser):
-    """Internal rich text parser using the builtin html parser. Functions aren't be documented"""
+def style_runs(text_len: int, modifiers, default_modifiers, start_i: int) -> list[tuple[int, int, dict]]:
+    """Split the text in contiguous runs of characters sharing the same modifiers, as (start, end, modifiers)"""
+    events = []
+    for name, mods in modifiers.items():
+        for mod_i, mod in enumerate(mods):
+            mod_start, mod_end = max(0, mod[0]-start_i), min(text_len, mod[1]-start_i+1)
+            if mod_start < mod_end:
+                events.append((mod_start, True, name, mod_i))
+                events.append((mod_end, False, name, mod_i))
+    events.sort(key=lambda event: event[0])
+    # the open modifiers of each name sorted by index, the first one wins like in modifier_of_char
+    active = {name: [] for name in ModifierName}
+    runs = []
+    run_start = event_i = 0
+    while run_start < text_len:
+        while event_i < len(events) and events[event_i][0] == run_start:
+            _, opened, name, mod_i = events[event_i]
+            if opened:
+                bisect.insort(active[name], mod_i)
+            else:
+                active[name].remove(mod_i)
+            event_i += 1
+        run_end = events[event_i][0] if event_i < len(events) else text_len
+        run_mods = {}
+        for name, open_mods in active.items():
+            if len(open_mods) > 0:
+                mod = modifiers[name][open_mods[0]]
+                run_mods[name] = mod[2] if len(mod) == 3 else False
+            else:
+                run_mods[name] = default_modifiers[name]
+        if len(runs) > 0 and runs[-1][2] == run_mods:
+            runs[-1] = (runs[-1][0], run_end, run_mods)
+        else:
+            runs.append((run_start, run_end, run_mods))
+        run_start = run_end
+    return runs
+
+
+TAG_PATTERN: re.Pattern = re.compile(r"<(/?)([a-zA-Z][^\s/>]*)([^>]*)>")
+ATTR_PATTERN: re.Pattern = re.compile(r"""([^\s=/]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?""")
+
+
+def parse_number(value: str) -> int | float:
+    """Parse a rich text number attribute"""
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            raise UIError(f"Invalid rich text number '{value}'")
+
+
+def parse_color(value: str) -> str | tuple:
+    """Parse a rich text color attribute, either a color name, an hex string or a sequence of numbers"""
+    compact = value.replace(" ", "")
+    if compact.isalpha() or compact.startswith("#"):
+        return value
+    return tuple(parse_number(channel) for channel in compact.strip("()[]").split(","))
+
+
+class RichTextParser:
+    """Internal rich text parser with a tag tokenizer, remembering the last parsed texts. Functions aren't be documented"""
+    max_parsed: int = 256
 
     def __init__(self):
-        super().__init__()
+        self.parsed: collections.OrderedDict[str, tuple[str, dict]] = collections.OrderedDict()
         self.reset_text("")
 
     def reset_text(self, raw_text: str):
         self.raw_text: str = raw_text
         self.output_text: str = ""
+        self.output_parts: list[str] = []
+        self.output_len: int = 0
         self.modifiers = {
             ModifierName.font_name: [],
             ModifierName.font_size: [],
@@ -61,23 +132,56 @@ class RichTextParser(html_parser.HTMLParser):
         self.start_i_stack: list[int] = []
 
     def parse_text(self, raw_text: str) -> tuple[str]:
+        # the result is shared by every caller with the same text and must not be modified
+        parsed = self.parsed.get(raw_text, None)
+        if parsed is not None:
+            self.parsed.move_to_end(raw_text)
+            return parsed
         self.reset_text(raw_text)
         self.feed(self.raw_text)
-        self.close()
-        return self.output_text, self.modifiers
+        parsed = self.parsed[raw_text] = (self.output_text, self.modifiers)
+        if len(self.parsed) > self.max_parsed:
+            self.parsed.popitem(False)
+        return parsed
+
+    def feed(self, raw_text: str):
+        idx = 0
+        for match in TAG_PATTERN.finditer(raw_text):
+            if match.start() > idx:
+                self.handle_data(html.unescape(raw_text[idx:match.start()]))
+            tag, attrs = match.group(2).lower(), match.group(3)
+            if match.group(1):
+                self.handle_endtag(tag)
+            else:
+                self.handle_starttag(tag, self.parse_attrs(attrs))
+                if attrs.rstrip().endswith("/"):
+                    self.handle_endtag(tag)
+            idx = match.end()
+        if idx < len(raw_text):
+            self.handle_data(html.unescape(raw_text[idx:]))
+        self.output_text = "".join(self.output_parts)
+
+    def parse_attrs(self, attrs: str) -> list[tuple[str, str | None]]:
+        parsed = []
+        for name, value in ATTR_PATTERN.findall(attrs):
+            if value[:1] in ("'", '"'):
+                value = value[1:-1]
+            parsed.append((name.lower(), html.unescape(value) if value else None))
+        return parsed
 
     def handle_data(self, data: str) -> None:
-        self.output_text += data
+        self.output_parts.append(data)
+        self.output_len += len(data)
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
         self.modifiers_stack.append([tag, attrs])
-        self.start_i_stack.append(len(self.output_text))
+        self.start_i_stack.append(self.output_len)
 
     def handle_endtag(self, tag: str) -> None:
         try:
             modifier = self.modifiers_stack[-1]
             start_i = self.start_i_stack[-1]
-            end_i = len(self.output_text)-1
+            end_i = self.output_len-1
         except IndexError:
             return
 
@@ -111,7 +215,7 @@ class RichTextParser(html_parser.HTMLParser):
                     match attrmod:
                         case "size":
                             self.modifiers[ModifierName.font_size].append(
-                                [start_i, end_i, eval(value)])
+                                [start_i, end_i, parse_number(value)])
                         case "name":
                             self.modifiers[ModifierName.font_name].append(
                                 [start_i, end_i, value])
@@ -121,10 +225,10 @@ class RichTextParser(html_parser.HTMLParser):
                     match attrmod:
                         case "fg":
                             self.modifiers[ModifierName.fg_color].append(
-                                [start_i, end_i, value if value.replace(" ", "").isalpha() else eval(value)])
+                                [start_i, end_i, parse_color(value)])
                         case "bg":
                             self.modifiers[ModifierName.bg_color].append(
-                                [start_i, end_i, value if value.replace(" ", "").isalpha() else eval(value)])
+                                [start_i, end_i, parse_color(value)])
 
 
 class TextAlign(StrEnum):
@@ -156,9 +260,9 @@ class FontCache:
                 if cache_str in self.cache:
                     continue
 
-                font_func = pygame.font.SysFont if font_name is not None and font_name.lower(
-                ).replace(" ", "") in sysfonts else pygame.Font
-                self.cache[cache_str] = font_func(font_name, font_size)
+                sysfont = font_name is not None and font_name.lower(
+                ).replace(" ", "") in sysfonts
+                self.cache[cache_str] = Fonts.get(font_name, font_size, sysfont)
 
                 done_sizes.append(font_size)
             done_names.append(font_name)
@@ -167,6 +271,31 @@ class FontCache:
         self.cache = {}
 
 
+WORD_PATTERN: re.Pattern = re.compile(r"\S+\s*|\s+")
+
+
+def _set_font_mods(font: pygame.Font, mods):
+    font.bold, font.italic, font.underline, font.strikethrough = (
+        mods[ModifierName.bold],
+        mods[ModifierName.italic],
+        mods[ModifierName.underline],
+        mods[ModifierName.strikethrough],
+    )
+
+
+def _render_line(fragments: list) -> tuple[list, int, int]:
+    # fragments are [modifiers, font, text] of the same run, rendered with one call each
+    rendered, tallest, width = [], 0, 0
+    for mods, font, text in fragments:
+        _set_font_mods(font, mods)
+        surf = font.render(text, mods[ModifierName.antialiasing],
+                           mods[ModifierName.fg_color], mods[ModifierName.bg_color])
+        rendered.append(surf)
+        tallest = max(tallest, surf.get_height())
+        width += surf.get_width()
+    return rendered, tallest, width
+
+
 def render(text: str,
            modifiers,
            default_modifiers,
@@ -180,52 +309,39 @@ def render(text: str,
            ) -> tuple[pygame.Surface, pygame.Rect | None]:
     font_cache.refresh_cache(modifiers, default_modifiers)
     text = text[start_i:] if end_i == -1 else text[start_i:end_i]
-
-    longest_line = cur_x = tallest_char = total_h = 0
-    lines, cur_line = [], []
-    for i, char in enumerate(text):
-        if char == "\n":
-            if cur_x > longest_line:
-                longest_line = cur_x
-            cur_line.append(tallest_char)
-            cur_line.append(cur_x)
-            if tallest_char > 0:
-                total_h += tallest_char
-            else:
-                font = font_cache.cache[f"{default_modifiers[ModifierName.font_name]}_{default_modifiers[ModifierName.font_size]}"]
-                total_h += font.get_height()
-            lines.append(cur_line)
-            tallest_char = cur_x = 0
-            cur_line = []
-            continue
-        char_mods = modifiers_of_char(i, modifiers, default_modifiers, start_i)
-        font = font_cache.cache[f"{char_mods[ModifierName.font_name]}_{char_mods[ModifierName.font_size]}"]
-        char_w, char_h = font.size(char)
-        if wraplength != -1:
-            if cur_x + char_w > wraplength:
-                if cur_x > longest_line:
-                    longest_line = cur_x
-                cur_line.append(tallest_char)
-                cur_line.append(cur_x)
-                total_h += tallest_char
-                lines.append(cur_line)
-                tallest_char = cur_x = 0
-                cur_line = []
-
-        cur_line.append((char_mods, char_w, char_h, font, char))
-        if char_h > tallest_char:
-            tallest_char = char_h
-        cur_x += char_w
-
+    default_font = font_cache.cache[f"{default_modifiers[ModifierName.font_name]}_{default_modifiers[ModifierName.font_size]}"]
+
+    lines, fragments = [], []
+    cur_x = 0
+    for run_start, run_end, run_mods in style_runs(len(text), modifiers, default_modifiers, start_i):
+        font = font_cache.cache[f"{run_mods[ModifierName.font_name]}_{run_mods[ModifierName.font_size]}"]
+        _set_font_mods(font, run_mods)
+        for line_i, run_line in enumerate(text[run_start:run_end].split("\n")):
+            if line_i > 0:
+                lines.append(_render_line(fragments))
+                fragments, cur_x = [], 0
+            for word in WORD_PATTERN.findall(run_line):
+                word_w = font.size(word)[0]
+                if wraplength != -1 and cur_x > 0 and cur_x+word_w > wraplength:
+                    lines.append(_render_line(fragments))
+                    fragments, cur_x = [], 0
+                # words longer than the line are wrapped at the characters
+                parts = [word] if wraplength == -1 or word_w <= wraplength else list(word)
+                for part in parts:
+                    part_w = word_w if len(parts) == 1 else font.size(part)[0]
+                    if len(parts) > 1 and cur_x > 0 and cur_x+part_w > wraplength:
+                        lines.append(_render_line(fragments))
+                        fragments, cur_x = [], 0
+                    if len(fragments) > 0 and fragments[-1][0] is run_mods:
+                        fragments[-1][2] += part
+                    else:
+                        fragments.append([run_mods, font, part])
+                    cur_x += part_w
     if cur_x > 0:
-        if cur_x > longest_line:
-            longest_line = cur_x
-        cur_line.append(tallest_char)
-        cur_line.append(cur_x)
-        total_h += tallest_char
-        lines.append(cur_line)
-        
-    line_w = longest_line
+        lines.append(_render_line(fragments))
+
+    longest_line = line_w = max((line[2] for line in lines), default=0)
+    total_h = sum(line[1] if len(line[0]) > 0 else default_font.get_height() for line in lines)
     if mask is not None:
         if longest_line > mask.w:
             longest_line = mask.w
@@ -234,50 +350,29 @@ def render(text: str,
 
     render_surf = pygame.Surface((longest_line, total_h), pygame.SRCALPHA)
     render_surf.fill(0)
-    render_rect = pygame.Rect(
-        0, 0, mask.w, mask.h) if mask is not None else render_surf.get_rect()
 
-    y = i = 0
-    for line in lines:
+    y = 0
+    for rendered, tall, this_line_w in lines:
+        if len(rendered) <= 0:
+            y += default_font.get_height()
+            continue
         x = 0
-        tall = line[-2]
-        this_line_w = line[-1]
-        line.pop()
-        line.pop()
-        if len(line) > 0:
-            for c_mods, c_w, c_h, font, char in line:
-                rx = x
-                if align == TextAlign.right:
-                    rx = line_w-this_line_w+x
-                elif align == TextAlign.middle:
-                    rx = (line_w//2)-(this_line_w//2)+x
-                pos = (rx, y+((tall//2)-c_h//2))
-                x += c_w
-
-                if mask is not None:
-                    c1, c2 = mask.collidepoint(pos), mask.collidepoint(
-                        (pos[0]+c_w, pos[1]+c_h))
-                    if ((not c1 and not c2) and not strict_mask) or ((not c1 or not c2) and strict_mask):
-                        i += 1
-                        continue
-                    pos = (pos[0]-mask.x, pos[1]-mask.y)
-
-                font.bold, font.italic, font.underline, font.strikethrough = (
-                    c_mods[ModifierName.bold],
-                    c_mods[ModifierName.italic],
-                    c_mods[ModifierName.underline],
-                    c_mods[ModifierName.strikethrough],
-                )
-                render_surf.blit(font.render(char,
-                                            c_mods[ModifierName.antialiasing],
-                                            c_mods[ModifierName.fg_color],
-                                            c_mods[ModifierName.bg_color]),
-                                pos)
-                i += 1
-            y += tall
-        else:
-            font = font_cache.cache[f"{default_modifiers[ModifierName.font_name]}_{default_modifiers[ModifierName.font_size]}"]
-            y += font.get_height()
+        if align == TextAlign.right:
+            x = line_w-this_line_w
+        elif align == TextAlign.middle:
+            x = (line_w//2)-(this_line_w//2)
+        for surf in rendered:
+            c_w, c_h = surf.get_size()
+            pos = (x, y+((tall//2)-c_h//2))
+            x += c_w
+            if mask is not None:
+                c1, c2 = mask.collidepoint(pos), mask.collidepoint(
+                    (pos[0]+c_w, pos[1]+c_h))
+                if ((not c1 and not c2) and not strict_mask) or ((not c1 or not c2) and strict_mask):
+                    continue
+                pos = (pos[0]-mask.x, pos[1]-mask.y)
+            render_surf.blit(surf, pos)
+        y += tall
     return render_surf
 
 
@@ -2,17 +2,25 @@ import pygame
 import typing
 import pathlib
 import os
+import re
+import pickle
+import hashlib
 import warnings
+import types
 from enum import StrEnum
 
-from .style import UIStyles, UIStyleHolder
+from .style import UIStyles, UIStyleHolder, UILazyValue
 from .error import UIScriptError
 from .enums import StyleType, StyleTarget, AnimEaseFunc, StyleAnimPropertyType
 from .icon import Icons
+from .images import Images
 from . import common
 from . import strimages
 
 
+CACHE_VERSION: int = 3
+
+
 class UISTT(StrEnum):
     """[Internal] The type enum of tokens"""
     left_paren = "left_paren"
@@ -203,8 +211,136 @@ class UIScriptLexer:
         return self
 
 
+class UIScriptRegexLexer:
+    """[Internal] Lexer for GSS scripts matching a compiled regex, producing the same tokens as UIScriptLexer"""
+    token_regex: re.Pattern = re.compile(r"""
+        (?P<ignore>[ \t\n]*)
+        (?:(?P<char>[(){};:.,#%$])
+        |(?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+        |(?P<number>[0-9][0-9.]*)
+        |(?P<comment>/[^\n]*)
+        |(?P<string>'[^']*')
+        |(?P<expr>\|[^|]*\|)
+        |(?P<dash>-)
+        |(?P<unknown>.)
+        |$)
+    """, re.VERBOSE | re.DOTALL)
+    char_types: dict[str, UISTT] = {
+        "(": UISTT.left_paren,
+        ")": UISTT.right_paren,
+        "{": UISTT.left_brace,
+        "}": UISTT.right_brace,
+        ";": UISTT.semicolon,
+        ":": UISTT.colon,
+        ".": UISTT.dot,
+        ",": UISTT.comma,
+        "#": UISTT.hash,
+        "%": UISTT.percent,
+        "$": UISTT.dollar,
+    }
+
+    def __init__(self, source: str, filename: str):
+        self.filename: str = filename
+        self.source: str = source
+        self.tokens: list[UIScriptToken] = []
+
+    def lex(self) -> typing.Self:
+        source, tokens, char_types = self.source, self.tokens, self.char_types
+        line, line_start, negative = 1, -1, False
+        for match in self.token_regex.finditer(source):
+            kind = match.lastgroup
+            if "\n" in match.group(1):
+                ignore_start, ignore = match.start(), match.group(1)
+                line += ignore.count("\n")
+                line_start = ignore_start+ignore.rfind("\n")
+            if kind == "ignore" or kind == "comment":
+                continue
+            start = match.start(kind)
+            if kind == "char":
+                tokens.append(UIScriptToken(
+                    char_types[match.group(kind)], None, line, start-line_start))
+            elif kind == "identifier":
+                value = match.group(kind)
+                if value == "null":
+                    tokens.append(UIScriptToken(
+                        UISTT.null, None, *self.get_next_position(match.end(), line, line_start)))
+                elif value == "true" or value == "false":
+                    tokens.append(UIScriptToken(
+                        UISTT.bool, value == "true", line, start-line_start))
+                else:
+                    tokens.append(UIScriptToken(
+                        UISTT.identifier, value, line, start-line_start))
+            elif kind == "number":
+                value = match.group(kind)
+                try:
+                    num = float(value) if "." in value else int(value)
+                except ValueError:
+                    raise UIScriptError(
+                        f"Invalid number '{value}' found in script '{self.filename}' at line {line}, column {start-line_start}")
+                tokens.append(UIScriptToken(
+                    UISTT.number, -num if negative else num, line, start-line_start))
+                negative = False
+            elif kind == "string" or kind == "expr":
+                value = match.group(kind)
+                tokens.append(UIScriptToken(
+                    UISTT.string if kind == "string" else UISTT.expr, value[1:-1], line, start-line_start))
+                if "\n" in value:
+                    line += value.count("\n")
+                    line_start = start+value.rfind("\n")
+            elif kind == "dash":
+                if start+1 < len(source) and source[start+1] in UIScriptLexer.number_chars:
+                    negative = True
+                else:
+                    tokens.append(UIScriptToken(
+                        UISTT.dash, None, *self.get_next_position(start+1, line, line_start)))
+            else:
+                value = match.group(kind)
+                if value == "'" or value == "|":
+                    raise UIScriptError(
+                        f"Unclosed '{value}' found in script '{self.filename}' at line {line}, column {start-line_start}")
+                raise UIScriptError(
+                    f"Unknown token '{value}' found in script '{self.filename}' at line {line}, column {start-line_start}")
+        tokens.append(UIScriptToken(
+            UISTT.eof, None, line, len(source)-line_start))
+        return self
+
+    def get_next_position(self, idx: int, line: int, line_start: int) -> tuple[int, int]:
+        if idx < len(self.source) and self.source[idx] == "\n":
+            return line+1, 0
+        return line, idx-line_start
+
+
+class UIScriptDependency:
+    """[Internal] Remember the tokens of a style instruction using variables, to compute its value again when they change"""
+
+    def __init__(self, variables: frozenset[str], tokens: list[UIScriptToken], filename: str,
+                 properties: dict[str, dict[str]], animations: list, key: tuple[str, str] | int, holders: list[UIStyleHolder]):
+        self.variables: frozenset[str] = variables
+        self.tokens: list[UIScriptToken] = tokens
+        self.filename: str = filename
+        self.properties: dict[str, dict[str]] = properties
+        self.animations: list = animations
+        self.key: tuple[str, str] | int = key
+        self.holders: list[UIStyleHolder] = holders
+
+    def evaluate(self, variables: dict[str]) -> tuple:
+        """Parse the instruction again with the given variables and return the parsed expression"""
+        last = self.tokens[-1]
+        parser = UIScriptParser(
+            self.tokens+[UIScriptToken(UISTT.eof, None, last.line, last.col)], self.filename, variables)
+        return parser.parse_style_instruction()
+
+    def store(self, expression: tuple):
+        """Store the value of an expression returned by evaluate in the holders"""
+        if isinstance(self.key, int):
+            self.animations[self.key] = expression[1:]
+        else:
+            self.properties[self.key[0]][self.key[1]] = expression[3]
+
+
 class UIScriptParser:
     "[Internal] Parser for GSS scripts"
+    compiled_exprs: dict[str, tuple[types.CodeType, frozenset[str]]] = {}
 
     def __init__(self, tokens: list[UIScriptToken], filename: str, variables: dict[str]):
         self.filename: str = filename
@@ -224,6 +360,11 @@ class UIScriptParser:
         self.tok: UIScriptToken = None
         self.idx: int = -1
         self.style_holders: list[UIStyleHolder] = []
+        self.icon_paths: list[str] = []
+        self.dependencies: list[UIScriptDependency] = []
+        self.used_variables: set[str] = set()
+        self.instruction_variables: dict[int, tuple[frozenset[str], list[UIScriptToken]]] = {}
+        self.rule_dependencies: dict[tuple[str, str] | int, tuple[frozenset[str], list[UIScriptToken]] | None] = {}
         self.advance()
 
     def error_suffix(self) -> str:
@@ -324,6 +465,7 @@ class UIScriptParser:
             raise UIScriptError(
                 f"Variable '{var_name}' does not exist, make sure to provide it to the ui manager;"+self.error_suffix())
         self.advance()
+        self.used_variables.add(var_name)
         return self.variables[var_name]
 
     def parse_list_value(self):
@@ -344,10 +486,22 @@ class UIScriptParser:
             self.advance()
         return values
 
+    def compile_expr(self, source: str) -> tuple[types.CodeType, frozenset[str]]:
+        if source in self.compiled_exprs:
+            return self.compiled_exprs[source]
+        try:
+            code = compile(source, "<gss expression>", "eval")
+        except Exception as e:
+            raise UIScriptError(
+                f"Tried to compile expression value '{source}', failed with error message: '{e}'"+self.error_suffix())
+        compiled = self.compiled_exprs[source] = (code, frozenset(_get_code_names(code)))
+        return compiled
+
     def parse_expr_value(self):
+        code, names = self.compile_expr(self.tok.value)
+        self.used_variables.update(names)
         try:
-            eval_value = eval(
-                self.tok.value, self.eval_globals, self.eval_globals)
+            eval_value = eval(code, self.eval_globals, self.eval_globals)
         except Exception as e:
             raise UIScriptError(
                 f"Tried to parse expression value '{self.tok.value}' with variables as globals using (blacklisted) python eval(), failed with error message: '{e}'"+self.error_suffix())
@@ -416,16 +570,20 @@ class UIScriptParser:
                 else:
                     warnings.warn(f"Warning: No builtin image exists with the name '{img_name}'. Available are {list(strimages.STRING_IMAGES_SURFACES.keys())}"+self.error_suffix(), UserWarning)
             else:
-                try:
-                    value = pygame.image.load(value).convert_alpha()
-                except:
+                if not os.path.isfile(value):
                     raise UIScriptError(
                         f"Could not auto-load surface from path '{value}'"+self.error_suffix())
+                if Images.background_loading:
+                    Images.preload(value)
+                value = UILazyValue(_load_image_ref, "path",
+                                    os.path.abspath(value))
         if comp_name == "icon" and property_name == "name" and value is not None and not value in Icons.icons and os.path.exists(value):
             path = pathlib.Path(value)
             if path.is_file():
-                Icons.add(path.name, pygame.image.load(
-                    value).convert_alpha())
+                Icons.add_path(path.name, value)
+                if Images.background_loading:
+                    Images.preload(value)
+                self.icon_paths.append(value)
             value = path.name
         if comp_name == "text" and property_name == "font_align":
             if value == "center":
@@ -487,6 +645,15 @@ class UIScriptParser:
             return self.parse_style_animation()
         return self.parse_style_property()
 
+    def parse_tracked_instruction(self) -> tuple:
+        start = self.idx
+        self.used_variables = set()
+        expression = self.parse_style_instruction()
+        if len(self.used_variables) > 0:
+            self.instruction_variables[id(expression)] = (
+                frozenset(self.used_variables), self.tokens[start:self.idx])
+        return expression
+
     def parse_style_body(self) -> list[tuple[str, str, typing.Any]]:
         if not self.tok.type == UISTT.left_brace:
             raise UIScriptError("Expected '{' at the start of the style body, got '"+str(
@@ -496,12 +663,12 @@ class UIScriptParser:
         if self.tok.type == UISTT.right_brace:
             self.advance()
             return expressions
-        expressions.append(self.parse_style_instruction())
+        expressions.append(self.parse_tracked_instruction())
         while self.tok.type == UISTT.semicolon:
             self.advance()
             if self.tok.type == UISTT.right_brace:
                 break
-            expressions.append(self.parse_style_instruction())
+            expressions.append(self.parse_tracked_instruction())
         if not self.tok.type == UISTT.right_brace:
             raise UIScriptError("Expected '}' at the end of the style body, got '" +
                                 str(self.tok)+"' instead"+self.error_suffix())
@@ -510,15 +677,26 @@ class UIScriptParser:
 
     def parse_style_properties_animations(self, expressions: list[tuple[str, str, typing.Any]]) -> tuple[dict[str, dict[str]], list]:
         properties, animations = {}, []
+        self.rule_dependencies = {}
         for expr in expressions:
             if expr[0]:
+                key = len(animations)
                 animations.append(expr[1:])
             else:
+                key = (expr[1], expr[2])
                 if expr[1] not in properties:
                     properties[expr[1]] = {}
                 properties[expr[1]][expr[2]] = expr[3]
+            self.rule_dependencies[key] = self.instruction_variables.get(
+                id(expr), None)
         return properties, animations
 
+    def make_style_dependencies(self, properties: dict[str, dict[str]], animations: list, holders: list[UIStyleHolder]):
+        for key, dependency in self.rule_dependencies.items():
+            if dependency is not None:
+                self.dependencies.append(UIScriptDependency(
+                    dependency[0], dependency[1], self.filename, properties, animations, key, holders))
+
     def make_style_holder(self, style_type: StyleType, style_target: StyleTarget, target_id: str, properties: dict[str, dict[str]], animations: list):
         self.style_holders.append(UIStyleHolder(
             properties, animations, style_type, style_target, target_id))
@@ -526,9 +704,11 @@ class UIScriptParser:
     def parse_style(self):
         target, target_ids = self.parse_style_target()
         main_type, copy_type, also_normal = self.parse_style_type()
+        self.instruction_variables = {}
         expressions = self.parse_style_body()
         properties, animations = self.parse_style_properties_animations(
             expressions)
+        first_holder = len(self.style_holders)
         for target_id in target_ids:
             if not copy_type:
                 self.make_style_holder(
@@ -544,6 +724,8 @@ class UIScriptParser:
                 if also_normal:
                     self.make_style_holder(
                         StyleType.normal, target, target_id, properties, animations)
+        self.make_style_dependencies(
+            properties, animations, self.style_holders[first_holder:])
 
     def parse(self) -> typing.Self:
         while self.tok and self.tok.type in [UISTT.dot, UISTT.hash, UISTT, UISTT.identifier]:
@@ -554,14 +736,64 @@ class UIScriptParser:
         return self
 
 
+def _get_code_names(code: types.CodeType) -> set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_code_names(const)
+    return names
+
+
+class _UIScriptPickler(pickle.Pickler):
+    def __init__(self, file):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.image_refs: dict[int, tuple[str, str]] = {
+            id(surface): ("builtin", name) for name, surface in strimages.STRING_IMAGES_SURFACES.items()}
+        self.image_refs[id(strimages._1X1SURF)] = ("builtin", "1x1")
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, pygame.Surface):
+            return None
+        if id(obj) not in self.image_refs:
+            raise pickle.PicklingError(
+                "Only builtin images and images loaded from a path can be cached")
+        return self.image_refs[id(obj)]
+
+
+class _UIScriptUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: tuple[str, str]) -> UILazyValue:
+        return UILazyValue(_load_image_ref, *pid)
+
+
+def _load_image_ref(kind: str, name: str) -> pygame.Surface:
+    if kind == "builtin":
+        return strimages._1X1SURF if name == "1x1" else strimages.STRING_IMAGES_SURFACES[name]
+    try:
+        return Images.get(name)
+    except:
+        raise UIScriptError(
+            f"Could not auto-load surface from path '{name}' used by a UI Script")
+
+
 class UIScript:
-    """Manage style script execution by lexing and parsing"""
-    already_parsed: list[str] = []
+    """Manage style script execution by lexing and parsing. Files and sources are loaded in a scope, None being shared by all managers"""
+    already_parsed: list[tuple[int | str | None, str]] = []
+    cache_dir: str | None = None
+    file_holders: dict[tuple[int | str | None, str], list[UIStyleHolder]] = {}
+    file_mtimes: dict[tuple[int | str | None, str], float] = {}
+    file_dependencies: dict[tuple[int | str | None, str], list[UIScriptDependency]] = {}
+    file_variables: dict[tuple[int | str | None, str], dict[str]] = {}
+    reloads: list[set[tuple[str, str]]] = []
+    inline_ids: dict[tuple[str, int], str] = {}
+    inline_sources: dict[str, tuple[str, dict[str]]] = {}
+    inline_refs: dict[str, int] = {}
+    inline_counter: int = 0
     
     @classmethod
-    def parse_script(cls, filename: str, variables: dict[str]):
+    def parse_script(cls, filename: str, variables: dict[str], scope: int | str | None = None):
         """Load styles and animations from a GSS file using the given variables"""
-        if filename in cls.already_parsed:
+        key = (scope, filename)
+        if key in cls.already_parsed:
             return
         if not os.path.exists(filename):
             raise UIScriptError(
@@ -569,18 +801,229 @@ class UIScript:
         source = ""
         with open(filename, "r") as file:
             source = file.read()
-        lexer = UIScriptLexer(source, filename).lex()
-        parser = UIScriptParser(lexer.tokens, filename, variables).parse()
-        UIStyles.add_styles(*parser.style_holders)
-        cls.already_parsed.append(filename)
+        style_holders, cls.file_dependencies[key] = cls._parse(
+            source, filename, variables)
+        UIStyles.add_styles(*style_holders, scope=scope)
+        cls.already_parsed.append(key)
+        cls.file_variables[key] = variables
+        cls.file_holders[key] = style_holders
+        cls.file_mtimes[key] = os.path.getmtime(filename)
 
     @classmethod
-    def parse_source(cls, source: str, filename: str, variables: dict[str]):
+    def reload_changed(cls, variables: dict[str], scopes: tuple[int | str, ...] = ()) -> int:
+        """Parse again the shared GSS files and the ones of the scopes modified since they were loaded, replacing their style holders. Return how many files were reloaded"""
+        reloaded = 0
+        for key, mtime in list(cls.file_mtimes.items()):
+            file_scope, filename = key
+            if file_scope is not None and file_scope not in scopes:
+                continue
+            if not os.path.exists(filename) or os.path.getmtime(filename) == mtime:
+                continue
+            cls.file_mtimes[key] = os.path.getmtime(filename)
+            try:
+                with open(filename, "r") as file:
+                    source = file.read()
+                style_holders, dependencies = cls._parse(
+                    source, filename, cls.file_variables.get(key, variables))
+            except UIScriptError as error:
+                warnings.warn(
+                    f"Warning: UI Script file '{filename}' was not reloaded: {error}", UserWarning)
+                continue
+            for holder in style_holders:
+                holder.scope = file_scope
+            old_holders = cls.file_holders[key]
+            UIStyles.replace_styles(old_holders, style_holders)
+            cls.file_holders[key] = style_holders
+            cls.file_dependencies[key] = dependencies
+            cls.reloads.append(cls._changed_selectors(
+                old_holders, style_holders))
+            reloaded += 1
+        return reloaded
+
+    @classmethod
+    def _changed_selectors(cls, old_holders: list[UIStyleHolder], new_holders: list[UIStyleHolder]) -> set[tuple[str, str]]:
+        old_selectors, new_selectors = {}, {}
+        for holders, selectors in [(old_holders, old_selectors), (new_holders, new_selectors)]:
+            for holder in holders:
+                selectors.setdefault((holder.style_target, holder.target_id), []).append(
+                    (holder.style_type, holder.properties, holder.animations))
+        if list(old_selectors) != list(new_selectors):
+            return set(old_selectors) | set(new_selectors)
+        return {selector for selector in old_selectors if old_selectors[selector] != new_selectors[selector]}
+
+    @classmethod
+    def parse_source(cls, source: str, filename: str, variables: dict[str], scope: int | str | None = None):
         """Load styles and animations from a GSS source using the given variables. The filename is needed for error messages"""
-        if filename in cls.already_parsed:
+        key = (scope, filename)
+        if key in cls.already_parsed:
             return
-        lexer = UIScriptLexer(source, filename).lex()
-        if len(lexer.tokens) > 0:
-            parser = UIScriptParser(lexer.tokens, filename, variables).parse()
-        UIStyles.add_styles(*parser.style_holders)
-        cls.already_parsed.append(filename)
+        style_holders, cls.file_dependencies[key] = cls._parse(
+            source, filename, variables)
+        UIStyles.add_styles(*style_holders, scope=scope)
+        cls.already_parsed.append(key)
+        cls.file_variables[key] = variables
+
+    @classmethod
+    def unload_scope(cls, scope: int | str):
+        """Remove the styles of the files and sources loaded in a scope"""
+        cls.already_parsed = [
+            key for key in cls.already_parsed if key[0] != scope]
+        for files_dict in [cls.file_holders, cls.file_mtimes, cls.file_dependencies, cls.file_variables]:
+            for key in [key for key in files_dict if key[0] == scope]:
+                del files_dict[key]
+        UIStyles.remove_scope(scope)
+
+    @classmethod
+    def parse_inline_source(cls, source: str, variables: dict[str]) -> str:
+        """Load an inline style from a source using 'ID' as the style name and return its style id. The same source with the same variables dict returns the same style id"""
+        key = (source, id(variables))
+        style_id = cls.inline_ids.get(key, None)
+        if style_id is None:
+            cls.inline_counter += 1
+            style_id = f"quickstyle_{cls.inline_counter}"
+            cls.inline_sources[style_id] = (source, variables)
+            try:
+                cls._register_inline(style_id)
+            except UIScriptError:
+                del cls.inline_sources[style_id]
+                raise
+            cls.inline_ids[key] = style_id
+        elif style_id not in cls.inline_refs:
+            cls._register_inline(style_id)
+        return style_id
+
+    @classmethod
+    def _register_inline(cls, style_id: str):
+        source, variables = cls.inline_sources[style_id]
+        filename = f"quickstyle.ID:{style_id}.gss"
+        style_holders, dependencies = cls._parse(
+            source.replace("ID", style_id), filename, variables)
+        for holder in style_holders:
+            if holder.style_target != StyleTarget.style_id or holder.target_id != style_id:
+                raise UIScriptError(
+                    f"Inline styles can only style 'ID', got '{holder.style_target}' '{holder.target_id}' instead in script '{filename}'")
+        UIStyles.add_inline_styles(style_id, style_holders)
+        cls.file_dependencies[(None, filename)] = dependencies
+        cls.file_variables[(None, filename)] = variables
+        cls.inline_refs[style_id] = 0
+
+    @classmethod
+    def retain_inline(cls, style_id: str):
+        """[Internal] Count an element using the inline styles in the given style id, loading them again if they were released"""
+        if len(cls.inline_sources) <= 0:
+            return
+        for inline_id in style_id.replace(" ", "").replace(",", ";").split(";"):
+            if inline_id not in cls.inline_sources:
+                continue
+            if inline_id not in cls.inline_refs:
+                cls._register_inline(inline_id)
+            cls.inline_refs[inline_id] += 1
+
+    @classmethod
+    def release_inline(cls, style_id: str):
+        """[Internal] Stop counting an element using the inline styles in the given style id, removing the styles no element uses. The style id stays valid"""
+        if len(cls.inline_refs) <= 0:
+            return
+        for inline_id in style_id.replace(" ", "").replace(",", ";").split(";"):
+            if inline_id not in cls.inline_refs:
+                continue
+            cls.inline_refs[inline_id] -= 1
+            if cls.inline_refs[inline_id] > 0:
+                continue
+            del cls.inline_refs[inline_id]
+            cls.file_dependencies.pop(
+                (None, f"quickstyle.ID:{inline_id}.gss"), None)
+            cls.file_variables.pop(
+                (None, f"quickstyle.ID:{inline_id}.gss"), None)
+            UIStyles.remove_inline_styles(inline_id)
+
+    @classmethod
+    def update_variables(cls, variables: dict[str], names: set[str], scopes: tuple[int | str, ...] = ()) -> set[tuple[str, str]]:
+        """Compute again the style values using the given variable names of the sources loaded with the variables dict or in the scopes. Return the (style_target, target_id) selectors of the changed styles"""
+        updates = []
+        for key, dependencies in cls.file_dependencies.items():
+            file_scope, filename = key
+            if cls.file_variables.get(key, None) is not variables and (file_scope is None or file_scope not in scopes):
+                continue
+            for dependency in dependencies:
+                if dependency.variables.isdisjoint(names):
+                    continue
+                try:
+                    updates.append((dependency, dependency.evaluate(variables)))
+                except UIScriptError as error:
+                    raise UIScriptError(
+                        f"Could not update the variables {sorted(dependency.variables & names)} used in script '{filename}': {error}") from error
+        selectors = set()
+        for dependency, expression in updates:
+            dependency.store(expression)
+            selectors.update((holder.style_target, holder.target_id)
+                             for holder in dependency.holders)
+        if len(selectors) > 0:
+            UIStyles._invalidate()
+        return selectors
+
+    @classmethod
+    def set_cache_dir(cls, cache_dir: str | None):
+        """Set the directory where parsed GSS sources are cached, to skip lexing and parsing when a source and the variables it uses didn't change. None disables the cache"""
+        cls.cache_dir = cache_dir
+
+    @classmethod
+    def _parse(cls, source: str, filename: str, variables: dict[str]) -> tuple[list[UIStyleHolder], list[UIScriptDependency]]:
+        cache_path = cls._get_cache_path(source, variables)
+        if cache_path is not None:
+            cached = cls._read_cache(cache_path)
+            if cached is not None:
+                return cached
+        lexer = UIScriptRegexLexer(source, filename).lex()
+        parser = UIScriptParser(lexer.tokens, filename, variables).parse()
+        if cache_path is not None:
+            cls._write_cache(cache_path, parser)
+        return parser.style_holders, parser.dependencies
+
+    @classmethod
+    def _get_cache_path(cls, source: str, variables: dict[str]) -> str | None:
+        if cls.cache_dir is None:
+            return None
+        if "|" in source:
+            names = sorted(variables)
+        else:
+            names = sorted(set(re.findall(r"\$\s*([A-Za-z_][A-Za-z0-9_]*)", source)))
+        try:
+            used_variables = pickle.dumps(
+                [(name, name in variables, variables.get(name, None)) for name in names])
+        except Exception:
+            return None
+        key = hashlib.sha256(
+            f"{CACHE_VERSION}\0{source}\0".encode() + used_variables).hexdigest()
+        return os.path.join(cls.cache_dir, f"{key}.gssc")
+
+    @classmethod
+    def _read_cache(cls, cache_path: str) -> tuple[list[UIStyleHolder], list[UIScriptDependency]] | None:
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "rb") as file:
+                version, style_holders, icon_paths, dependencies = _UIScriptUnpickler(
+                    file).load()
+        except Exception:
+            return None
+        if version != CACHE_VERSION:
+            return None
+        for icon_path in icon_paths:
+            path = pathlib.Path(icon_path)
+            if path.name not in Icons.icons and path.is_file():
+                Icons.add_path(path.name, icon_path)
+        return style_holders, dependencies
+
+    @classmethod
+    def _write_cache(cls, cache_path: str, parser: UIScriptParser):
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cls.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                _UIScriptPickler(file).dump(
+                    (CACHE_VERSION, parser.style_holders, parser.icon_paths, parser.dependencies))
+            os.replace(temp_path, cache_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,89 @@
+import typing
+import collections
+if typing.TYPE_CHECKING:
+    from .manager import Manager
+
+STATS_COUNTERS: tuple[str] = (
+    "logic",
+    "render",
+    "render_cached",
+    "update_style",
+    "build_image",
+    "build_text",
+    "build_icon",
+    "surface_alloc",
+    "refresh_stack",
+    "events"
+)
+STATS_TIMES: tuple[str] = (
+    "event_ms",
+    "logic_ms",
+    "render_ms"
+)
+
+
+class UIStats:
+    """
+    Count the work done by a manager each frame and keep a rolling window of the last frames. Disabled by default\n
+    A frame ends when the manager renders. Counters are elements that ran logic, re-rendered, reused a cached state surface, updated the style, built the image/text/icon component,
+    reallocated a surface, refreshed a stack and posted events. Times are the milliseconds spent in event, logic and render
+    """
+
+    def __init__(self, manager: "Manager"):
+        self.manager: "Manager" = manager
+        self.enabled: bool = False
+        self.frame: dict[str, float] = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        self.last_frame: dict[str, float] = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        self.history: collections.deque[dict[str, float]] = collections.deque(maxlen=120)
+
+    def enable(self) -> typing.Self:
+        """Start counting"""
+        self.enabled = True
+        return self
+
+    def disable(self) -> typing.Self:
+        """Stop counting and reset the counters"""
+        self.enabled = False
+        return self.reset()
+
+    def reset(self) -> typing.Self:
+        """Clear the current frame, the last frame and the rolling window"""
+        self.frame = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        self.last_frame = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        self.history.clear()
+        return self
+
+    def set_window_size(self, frames: int) -> typing.Self:
+        """Set how many frames the rolling window keeps for the averages"""
+        self.history = collections.deque(self.history, maxlen=max(1, int(frames)))
+        return self
+
+    def get_last_frame(self) -> dict[str, float]:
+        """Return the counters and times of the last completed frame"""
+        return self.last_frame.copy()
+
+    def get_averages(self) -> dict[str, float]:
+        """Return the average counters and times over the rolling window"""
+        averages = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        if len(self.history) <= 0:
+            return averages
+        for frame in self.history:
+            for name, value in frame.items():
+                averages[name] += value
+        for name in averages:
+            averages[name] /= len(self.history)
+        return averages
+
+    def get_max(self) -> dict[str, float]:
+        """Return the highest counters and times over the rolling window"""
+        maxes = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
+        for frame in self.history:
+            for name, value in frame.items():
+                if value > maxes[name]:
+                    maxes[name] = value
+        return maxes
+
+    def _end_frame(self):
+        self.last_frame = self.frame
+        self.history.append(self.frame)
+        self.frame = dict.fromkeys(STATS_COUNTERS+STATS_TIMES, 0)
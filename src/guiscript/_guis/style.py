@@ -1,16 +1,58 @@
 import pygame
 import typing
-import pathlib
+import copy
 if typing.TYPE_CHECKING:
     from .elements.element import Element
 
 from .animation import UIStyleAnim
 from .error import UIError
+from .fonts import Fonts
 from . import common
 from . import enums
 
-
-class UICompStyle:
+COMP_STYLE_NAMES: tuple[str] = ("stack", "bg", "image", "shape", "text", "icon", "outline")
+
+
+class UISharedStyle:
+    """[Internal] Base class for style data shared by elements with the same resolved style, copied the first time one of them writes to it. Lists and dicts are copied for each element"""
+    __slots__ = ("_shared", "_mutable", "__dict__")
+
+    def __setattr__(self, name: str, value):
+        if getattr(self, "_shared", False):
+            object.__setattr__(self, "__dict__", self.__dict__.copy())
+            object.__setattr__(self, "_shared", False)
+        object.__setattr__(self, name, value)
+
+    def _share(self) -> typing.Self:
+        shared = object.__new__(self.__class__)
+        mutable = tuple(name for name, value in self.__dict__.items() if isinstance(value, (list, dict)))
+        if mutable:
+            # in-place edits to lists and dicts can't be caught, so each element gets its own copy of them
+            properties = self.__dict__.copy()
+            for name in mutable:
+                properties[name] = copy.deepcopy(properties[name])
+            _set_shared_dict(shared, properties)
+        else:
+            _set_shared_dict(shared, self.__dict__)
+        _set_shared_flag(shared, True)
+        _set_mutable_names(shared, mutable)
+        return shared
+
+    def _matches_shared(self, template: "UISharedStyle") -> bool:
+        if not self._shared:
+            return False
+        for name in getattr(self, "_mutable", ()):
+            if self.__dict__[name] != template.__dict__[name]:
+                return False
+        return True
+
+
+_set_shared_dict = UISharedStyle.__dict__["__dict__"].__set__
+_set_shared_flag = UISharedStyle._shared.__set__
+_set_mutable_names = UISharedStyle._mutable.__set__
+
+
+class UICompStyle(UISharedStyle):
     """Base style class for element components"""
 
     def __init__(self, enabled: bool):
@@ -23,7 +65,7 @@ class UICompStyle:
         return self
 
 
-class UIStackStyle:
+class UIStackStyle(UISharedStyle):
     """Style class for stacks-like elements"""
 
     def __init__(self):
@@ -126,21 +168,17 @@ class UITextStyle(UICompStyle):
 
     def build_font(self) -> typing.Self:
         """Build the font object after changes in the font properties"""
-        func = pygame.font.SysFont if self.sysfont else pygame.Font
-        font_name = self.font_name
-        if font_name == "googleicons":
-            font_name = str(pathlib.Path(__file__).parent) + "/googleiconsfontttf.py"
-            func = pygame.Font
-        self.font = func(font_name, int(self.font_size))
-        return self
+        self._font_source = (self.font_name, self.font_size, self.sysfont)
+        self._font_modifiers = None
+        return self.apply_mods()
 
     def apply_mods(self) -> typing.Self:
         """Apply text modifiers to the font object"""
-        self.font.align = self.font_align
-        self.font.bold = self.bold
-        self.font.italic = self.italic
-        self.font.underline = self.underline
-        self.font.strikethrough = self.strikethrough
+        modifiers = (self.font_align, self.bold, self.italic,
+                     self.underline, self.strikethrough)
+        if modifiers != self._font_modifiers:
+            self._font_modifiers = modifiers
+            self.font = Fonts.get(*self._font_source, modifiers)
         return self
 
 
@@ -167,19 +205,30 @@ class UIOutlineStyle(UICompStyle):
 
 
 class UIStyle:
-    """Class that holds all the component styles and the animations"""
-
-    def __init__(self):
-        self.stack: UIStackStyle = UIStackStyle()
-        self.bg: UIBGStyle = UIBGStyle()
-        self.image: UIImageStyle = UIImageStyle()
-        self.shape: UIShapeStyle = UIShapeStyle()
-        self.text: UITextStyle = UITextStyle()
-        self.icon: UIIconStyle = UIIconStyle()
-        self.outline: UIOutlineStyle = UIOutlineStyle()
+    """Class that holds all the component styles and the animations. The component styles of a template are shared until written to"""
+
+    def __init__(self, template: "UIStyle | None" = None):
+        self.template: UIStyle | None = template
+        if template is None:
+            self.stack: UIStackStyle = UIStackStyle()
+            self.bg: UIBGStyle = UIBGStyle()
+            self.image: UIImageStyle = UIImageStyle()
+            self.shape: UIShapeStyle = UIShapeStyle()
+            self.text: UITextStyle = UITextStyle()
+            self.icon: UIIconStyle = UIIconStyle()
+            self.outline: UIOutlineStyle = UIOutlineStyle()
+        else:
+            self.stack: UIStackStyle = template.stack._share()
+            self.bg: UIBGStyle = template.bg._share()
+            self.image: UIImageStyle = template.image._share()
+            self.shape: UIShapeStyle = template.shape._share()
+            self.text: UITextStyle = template.text._share()
+            self.icon: UIIconStyle = template.icon._share()
+            self.outline: UIOutlineStyle = template.outline._share()
 
         self.style_group: "UIStyleGroup" = None
         self.dirty: bool = True
+        self.dirty_components: set[str] = set()
         self.animations: list[UIStyleAnim] = []
         self.styles: tuple[UICompStyle] = (
             self.bg, self.image, self.shape, self.text, self.outline)
@@ -208,6 +257,15 @@ class UIStyle:
         for anim in self.animations:
             anim.start()
 
+    def is_template_shared(self) -> bool:
+        """[Internal] Return whether no component style was written since the style was created from its template"""
+        if self.template is None:
+            return False
+        for name in COMP_STYLE_NAMES:
+            if not getattr(self, name)._matches_shared(getattr(self.template, name)):
+                return False
+        return True
+
 
 def _default_style() -> UIStyle:
     return UIStyle()
@@ -225,6 +283,32 @@ def _default_press_style() -> UIStyle:
     return default_press
 
 
+class UILazyValue:
+    """[Internal] Style property value loaded the first time a style uses it"""
+
+    def __init__(self, loader: typing.Callable, *args):
+        self.loader: typing.Callable = loader
+        self.args: tuple = args
+        self.loaded: bool = False
+        self.value = None
+
+    def get(self) -> typing.Any:
+        """Return the value, loading it the first time"""
+        if not self.loaded:
+            self.value = self.loader(*self.args)
+            self.loaded = True
+        return self.value
+
+    def __getstate__(self) -> dict:
+        return {"loader": self.loader, "args": self.args, "loaded": False, "value": None}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, UILazyValue) and (self.loader, self.args) == (other.loader, other.args)
+
+    def __hash__(self) -> int:
+        return hash((self.loader, self.args))
+
+
 class UIStyleHolder:
     """[Internal] Hold style data generated from a loaded script"""
 
@@ -239,10 +323,14 @@ class UIStyleHolder:
         self.style_type: str = style_type
         self.style_target: str = style_target
         self.target_id: str = target_id
+        self.scope: int | str | None = None
 
     def copy_as_type(self, style_type: enums.StyleType | str) -> "UIStyleHolder":
         """Return the same holder with a different style_type"""
-        return UIStyleHolder(self.properties, self.animations, style_type, self.style_target, self.target_id)
+        holder = UIStyleHolder(self.properties, self.animations,
+                               style_type, self.style_target, self.target_id)
+        holder.scope = self.scope
+        return holder
 
     def __repr__(self):
         return f"UIStyleHolder(style_type={self.style_type}, style_target={self.style_target}, target_id={self.target_id}, \nproperties={self.properties}\n)\n"
@@ -261,20 +349,105 @@ class UIStyleGroup:
 
 
 class UIStyles:
-    """[Internal] Style manager for style holders"""
+    """[Internal] Style manager for style holders. Holders are indexed by scope, type, target and id and the resolved style of each selector is memoized as a shared template until a holder is added. Elements only use the shared holders (scope None) and the ones of their manager's scopes (its own and the active theme)"""
     styles: list[UIStyleHolder] = []
+    generation: int = 0
+    holders_index: dict[tuple[int | str | None, str, str, str], list[tuple[int, UIStyleHolder]]] = {}
+    resolved_cache: dict[tuple, tuple[UIStyle, list]] = {}
+    resolved_holders: dict[tuple, tuple[UIStyle, list]] = {}
+    style_diffs: dict[tuple[int, int], frozenset[str]] = {}
+    indexed_count: int = 0
+    inline_styles: dict[tuple[str, str], tuple[int, list[UIStyleHolder]]] = {}
+    inline_count: int = 0
 
     @classmethod
-    def add_style(cls, style_holder: UIStyleHolder) -> typing.Self:
-        """[Internal] Add a style holder"""
-        cls.styles.append(style_holder)
+    def add_style(cls, style_holder: UIStyleHolder, scope: int | str | None = None) -> typing.Self:
+        """[Internal] Add a style holder to a scope, None being shared by all managers"""
+        style_holder.scope = scope
+        cls._index_holder(style_holder)
+        cls._invalidate()
         return cls
 
     @classmethod
-    def add_styles(cls, *style_holders: UIStyleHolder) -> typing.Self:
-        """[Internal] Add multipple style holders at once"""
+    def add_styles(cls, *style_holders: UIStyleHolder, scope: int | str | None = None) -> typing.Self:
+        """[Internal] Add multipple style holders at once to a scope, None being shared by all managers"""
         for holder in style_holders:
-            cls.styles.append(holder)
+            holder.scope = scope
+            cls._index_holder(holder)
+        cls._invalidate()
+        return cls
+
+    @classmethod
+    def _index_holder(cls, style_holder: UIStyleHolder):
+        cls.holders_index.setdefault((style_holder.scope, style_holder.style_type, style_holder.style_target, style_holder.target_id), []).append(
+            (len(cls.styles), style_holder))
+        cls.styles.append(style_holder)
+        cls.indexed_count = len(cls.styles)
+
+    @classmethod
+    def _invalidate(cls):
+        cls.generation += 1
+        cls.resolved_cache.clear()
+        cls.resolved_holders.clear()
+        cls.style_diffs.clear()
+
+    @classmethod
+    def _check_index(cls):
+        if len(cls.styles) != cls.indexed_count:
+            cls._rebuild_index()
+
+    @classmethod
+    def _rebuild_index(cls):
+        cls.holders_index.clear()
+        styles, cls.styles = cls.styles, []
+        for holder in styles:
+            cls._index_holder(holder)
+        cls._invalidate()
+
+    @classmethod
+    def add_inline_styles(cls, style_id: str, style_holders: list[UIStyleHolder]) -> typing.Self:
+        """[Internal] Add the style holders of an inline style, applied after the holders of the other style ids"""
+        cls.inline_count += 1
+        for style_type in [enums.StyleType.normal, enums.StyleType.hover, enums.StyleType.press]:
+            holders = [
+                holder for holder in style_holders if holder.style_type == style_type]
+            if len(holders) > 0:
+                cls.inline_styles[(style_type, style_id)] = (
+                    cls.inline_count, holders)
+        cls._invalidate()
+        return cls
+
+    @classmethod
+    def remove_inline_styles(cls, style_id: str) -> typing.Self:
+        """[Internal] Remove the style holders of an inline style and the resolved styles using it"""
+        for style_type in [enums.StyleType.normal, enums.StyleType.hover, enums.StyleType.press]:
+            cls.inline_styles.pop((style_type, style_id), None)
+        for key in [key for key in cls.resolved_cache if style_id in key[2]]:
+            del cls.resolved_cache[key]
+        return cls
+
+    @classmethod
+    def remove_scope(cls, scope: int | str) -> typing.Self:
+        """[Internal] Remove all the style holders of a scope"""
+        cls.styles = [holder for holder in cls.styles if holder.scope != scope]
+        cls._rebuild_index()
+        return cls
+
+    @classmethod
+    def replace_styles(cls, old_holders: list[UIStyleHolder], new_holders: list[UIStyleHolder]) -> typing.Self:
+        """[Internal] Replace style holders with new ones, taking the priority of the first old holder"""
+        old_holders = set(old_holders)
+        styles = []
+        for holder in cls.styles:
+            if holder not in old_holders:
+                styles.append(holder)
+            elif new_holders is not None:
+                styles += new_holders
+                new_holders = None
+        if new_holders is not None:
+            styles += new_holders
+        cls.styles = styles
+        cls._rebuild_index()
         return cls
 
     @classmethod
@@ -299,55 +472,115 @@ class UIStyles:
     @classmethod
     def get_style_of_type(cls, element: "Element", type_: enums.StyleType | str) -> tuple[UIStyle, list]:
         """[Internal] Return a new style for a given element using matching style holders of a given type"""
+        template, animations = cls.get_resolved(element, type_)
+        return UIStyle(template), animations.copy()
+
+    @classmethod
+    def is_style_group_current(cls, element: "Element") -> bool:
+        """[Internal] Return whether the style group of an element was built from the styles it would resolve to now"""
+        group = element.style_group
+        return (group.style.template is cls.get_resolved(element, "normal")[0]
+                and group.hover_style.template is cls.get_resolved(element, "hover")[0]
+                and group.press_style.template is cls.get_resolved(element, "press")[0])
+
+    @classmethod
+    def get_changed_components(cls, old_style: UIStyle, new_style: UIStyle) -> frozenset[str]:
+        """[Internal] Return the names of the component styles with different values in two styles, memoized for styles still sharing their templates"""
+        key = None
+        if old_style.is_template_shared() and new_style.is_template_shared():
+            key = (id(old_style.template), id(new_style.template))
+            changed = cls.style_diffs.get(key, None)
+            if changed is not None:
+                return changed
+        changed = frozenset(name for name in COMP_STYLE_NAMES
+                            if getattr(old_style, name).__dict__ != getattr(new_style, name).__dict__)
+        if key is not None:
+            cls.style_diffs[key] = changed
+        return changed
+
+    @classmethod
+    def get_resolved(cls, element: "Element", type_: enums.StyleType | str) -> tuple[UIStyle, list]:
+        """[Internal] Return the memoized template style and animations of a given element and type"""
+        el_types, style_id, el_id = element.element_types, element.style_id.strip(
+        ), element.element_id.strip()
+        style_ids = frozenset(style_id.replace(
+            " ", "").replace(",", ";").split(";"))
+        scopes = element.manager.style_scopes
+        key = (type_, tuple(el_types), style_ids, el_id, scopes)
+        cls._check_index()
+        resolved = cls.resolved_cache.get(key, None)
+        if resolved is None:
+            resolved = cls.resolved_cache[key] = cls._resolve(
+                type_, key[1], style_ids, el_id, scopes)
+        return resolved
+
+    @classmethod
+    def _get_holders(cls, scopes: tuple[int | str, ...], style_type: str, style_target: str, target_id: str) -> list[tuple[tuple[int, int], UIStyleHolder]]:
+        # the first scope merges with the shared holders by registration order, the next ones (themes) are layered on top
+        holders = [((0, seq), holder) for seq, holder in cls.holders_index.get(
+            (None, style_type, style_target, target_id), [])]
+        for layer, scope in enumerate(scopes):
+            scope_holders = cls.holders_index.get(
+                (scope, style_type, style_target, target_id), None)
+            if scope_holders is None:
+                continue
+            holders += [((layer, seq), holder) for seq, holder in scope_holders]
+            if layer == 0:
+                holders.sort(key=lambda key_holder: key_holder[0])
+        return holders
+
+    @classmethod
+    def _resolve(cls, type_: str, el_types: tuple[str], style_ids: frozenset[str], el_id: str, scopes: tuple[int | str, ...]) -> tuple[UIStyle, list]:
+        holders: list[UIStyleHolder] = []
+        for el_t in dict.fromkeys(el_types):
+            holders += [holder for _, holder in cls._get_holders(
+                scopes, type_, "element_type", el_t)]
+        style_id_holders = []
+        for style_id in style_ids:
+            style_id_holders += cls._get_holders(
+                scopes, type_, "style_id", style_id)
+        holders += [holder for _, holder in sorted(
+            style_id_holders, key=lambda key_holder: key_holder[0])]
+        if len(cls.inline_styles) > 0:
+            inline_holders = [cls.inline_styles[(type_, style_id)] for style_id in style_ids
+                              if (type_, style_id) in cls.inline_styles]
+            for _, inline in sorted(inline_holders, key=lambda seq_holders: seq_holders[0]):
+                holders += inline
+        holders += [holder for _, holder in cls._get_holders(
+            scopes, type_, "element_id", el_id)]
+        holders_key = (type_, tuple(id(holder) for holder in holders))
+        resolved = cls.resolved_holders.get(holders_key, None)
+        if resolved is not None:
+            return resolved
         match type_:
             case "normal":
-                style = _default_style()
+                template = _default_style()
             case "hover":
-                style = _default_hover_style()
+                template = _default_hover_style()
             case "press":
-                style = _default_press_style()
-        el_types, style_id, el_id = element.element_types, element.style_id.strip(
-        ), element.element_id.strip()
-        style_id_styles, el_id_styles = [], []
+                template = _default_press_style()
         animations: list = []
-        el_type_styles: dict[str, UIStyleHolder] = {
-            el_t: [] for el_t in el_types}
-        for style_holder in cls.styles:
-            if style_holder.style_type != type_:
-                continue
-            if style_holder.style_target == "element_type" and style_holder.target_id in el_type_styles:
-                el_type_styles[style_holder.target_id].append(style_holder)
-            elif style_holder.style_target == "style_id" and style_holder.target_id in style_id.replace(" ", "").replace(",", ";").split(";"):
-                style_id_styles.append(style_holder)
-            elif style_holder.style_target == "element_id" and style_holder.target_id == el_id:
-                el_id_styles.append(style_holder)
-        for el_type_styles_i in el_type_styles.values():
-            for el_type_style in el_type_styles_i:
-                cls.apply_style_properties(el_type_style.properties, style)
-                animations = cls.update_style_animations(
-                    animations, el_type_style.animations)
-        for style_id_style in style_id_styles:
-            cls.apply_style_properties(style_id_style.properties, style)
-            animations = cls.update_style_animations(
-                animations, style_id_style.animations)
-        for el_id_style in el_id_styles:
-            cls.apply_style_properties(el_id_style.properties, style)
+        for holder in holders:
+            cls.apply_style_properties(holder.properties, template)
             animations = cls.update_style_animations(
-                animations, el_id_style.animations)
-        style.text.build_font()
-        style.text.apply_mods()
-        return style, animations
+                animations, holder.animations)
+        template.text.build_font()
+        template.text.apply_mods()
+        resolved = cls.resolved_holders[holders_key] = (template, animations)
+        return resolved
 
     @classmethod
     def apply_style_properties(cls, properties: dict[str, dict[str]], style: UIStyle):
         """[Internal] Apply a property dictionary to a UIStyle"""
-        for comp_name in ["stack", "bg", "image", "shape", "text", "icon", "outline"]:
+        for comp_name in COMP_STYLE_NAMES:
             if comp_name in properties:
                 comp = getattr(style, comp_name)
                 for name, value in properties[comp_name].items():
                     if not hasattr(comp, name):
                         raise UIError(
                             f"{comp_name.title()} style has no property '{name}'")
+                    if isinstance(value, UILazyValue):
+                        value = value.get()
                     setattr(comp, name, value)
 
     @classmethod
@@ -0,0 +1,73 @@
+import pygame
+import typing
+
+
+class SurfacePool:
+    """Surface manager that lends size-bucketed SRCALPHA surfaces to elements, reused on resize and after destruction"""
+    bucket_size: int = 8
+    max_free: int = 16
+    free_surfaces: dict[tuple[int, int], list[pygame.Surface]] = {}
+
+    @classmethod
+    def set_bucket_size(cls, bucket_size: int) -> typing.Self:
+        """Set the smallest size step in pixels that pooled surfaces are rounded up to. Shorter sides aren't rounded. The unused surfaces are cleared"""
+        cls.bucket_size = max(1, int(bucket_size))
+        cls.free_surfaces.clear()
+        return cls
+
+    @classmethod
+    def set_max_free(cls, max_free: int) -> typing.Self:
+        """Set how many unused surfaces of the same size are kept for reuse"""
+        cls.max_free = max(0, int(max_free))
+        for free in cls.free_surfaces.values():
+            del free[cls.max_free:]
+        return cls
+
+    @classmethod
+    def clear(cls) -> typing.Self:
+        """Release the unused surfaces kept for reuse"""
+        cls.free_surfaces.clear()
+        return cls
+
+    @classmethod
+    def get_bucket(cls, size: tuple[int, int]) -> tuple[int, int]:
+        """Return the size of the pooled surface a surface of the given size is cut from"""
+        return (cls._round_up(max(1, int(size[0]))), cls._round_up(max(1, int(size[1]))))
+
+    @classmethod
+    def _round_up(cls, length: int) -> int:
+        if length <= cls.bucket_size:
+            return length
+        # steps of an eighth of the largest power of two below the length waste at most 12.5%
+        step = max(cls.bucket_size, (1 << (length.bit_length()-1)) >> 3)
+        return -(-length//step)*step
+
+    @classmethod
+    def borrow(cls, size: tuple[int, int], old_surface: pygame.Surface | None = None) -> pygame.Surface:
+        """[Internal] Return a SRCALPHA surface of the given size. The old surface is reused if it fits in the same bucket, otherwise it is released"""
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        bucket = cls.get_bucket(size)
+        base = None
+        if old_surface is not None:
+            old_base = old_surface.get_parent()
+            if old_base is not None and old_base.get_size() == bucket:
+                base = old_base
+            else:
+                cls.release(old_surface)
+        if base is None:
+            free = cls.free_surfaces.get(bucket, None)
+            base = free.pop() if free else pygame.Surface(
+                bucket, pygame.SRCALPHA)
+        return base.subsurface((0, 0), size)
+
+    @classmethod
+    def release(cls, surface: pygame.Surface | None):
+        """[Internal] Give back a surface returned by borrow so it can be reused"""
+        if surface is None:
+            return
+        base = surface.get_parent()
+        if base is None:
+            return
+        free = cls.free_surfaces.setdefault(base.get_size(), [])
+        if len(free) < cls.max_free and base not in free:
+            free.append(base)
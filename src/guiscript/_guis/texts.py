@@ -0,0 +1,71 @@
+import pygame
+import typing
+import collections
+
+
+class TextSurfaces:
+    """
+    Text surface manager that shares the rendered text of the elements, evicting the least recently used past max_bytes\n
+    Surfaces are keyed by text, font, font modifiers, antialiasing, colors and wrap width, and must not be modified
+    """
+    max_bytes: int = 8*1024*1024
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    surfaces: collections.OrderedDict[tuple, pygame.Surface] = collections.OrderedDict()
+
+    @classmethod
+    def set_max_bytes(cls, max_bytes: int) -> typing.Self:
+        """Set how many bytes of text surfaces are kept before evicting the least recently used. 0 disables the cache"""
+        cls.max_bytes = max(0, int(max_bytes))
+        cls._evict()
+        return cls
+
+    @classmethod
+    def clear(cls) -> typing.Self:
+        """Release the cached text surfaces. Elements keep the ones they already use"""
+        cls.surfaces.clear()
+        cls.bytes = 0
+        return cls
+
+    @classmethod
+    def reset_counters(cls) -> typing.Self:
+        """Set the hit and miss counters to 0"""
+        cls.hits = cls.misses = 0
+        return cls
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        """Return the hits, misses, number of surfaces and bytes of the cache"""
+        return {"hits": cls.hits, "misses": cls.misses, "surfaces": len(cls.surfaces), "bytes": cls.bytes}
+
+    @classmethod
+    def render(cls, font: pygame.Font, text: str, antialias: bool, color, bg_color=None, wraplength: int = 0) -> pygame.Surface:
+        """[Internal] Return the text rendered with the font, reusing the same surface for identical requests"""
+        key = (text, font, font.align, font.bold, font.italic, font.underline, font.strikethrough,
+               bool(antialias), cls._color_key(color), cls._color_key(bg_color), int(wraplength))
+        surface = cls.surfaces.get(key, None)
+        if surface is not None:
+            cls.hits += 1
+            cls.surfaces.move_to_end(key)
+            return surface
+        cls.misses += 1
+        surface = font.render(text, antialias, color, bg_color, wraplength)
+        size = surface.get_pitch()*surface.get_height()
+        if size <= cls.max_bytes:
+            cls.surfaces[key] = surface
+            cls.bytes += size
+            cls._evict()
+        return surface
+
+    @classmethod
+    def _color_key(cls, color) -> typing.Hashable:
+        if color is None or isinstance(color, (str, int, tuple)):
+            return color
+        return tuple(color)
+
+    @classmethod
+    def _evict(cls):
+        while cls.bytes > cls.max_bytes and len(cls.surfaces) > 0:
+            _, surface = cls.surfaces.popitem(False)
+            cls.bytes -= surface.get_pitch()*surface.get_height()
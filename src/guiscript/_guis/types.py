@@ -7,6 +7,7 @@ from . import navigation
 from . import status
 from . import buffer
 from . import cursors
+from . import stats
 from . import sound
 from .elements import stacks
 from .elements import scrollbars
@@ -23,6 +24,7 @@ type RootType = root.UIRoot
 type InteractType = interact.UIInteract
 type NavigationType = navigation.UINavigation
 type CursorsType = cursors.UICursors
+type StatsType = stats.UIStats
 
 type CompType = components.UIComponent
 type BGCompType = components.UIBackgroundComp
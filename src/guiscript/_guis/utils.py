@@ -1,7 +1,5 @@
 import pygame
 import typing
-import random
-import string
 
 from .manager import Manager
 from .animation import UIAnimUpdater
@@ -28,6 +26,7 @@ ALL_RESIZERS: tuple[enums.Resizer] = (enums.Resizer.top,
 ANCHOR_PARENT: str = "parent"
 NO_SOUND: str = "nosound"
 EXTENSION_FOLDER: str = "folder"
+_QUICK_STYLE_VARIABLES: dict[str] = {}
 
 
 def invis_element(relative_rect: pygame.Rect, element_id: str = "none", extra_style_id: str = "invisible",
@@ -187,21 +186,16 @@ def static_logic(delta_time: float = 1):
 
 
 def quick_style(style_source: str, gss_variables: dict = None) -> str:
-    """Parse a style source replacing 'ID' with a new random id and return it to assign to an element. If no variables are provided the current manager ones will be used"""
+    """Parse an inline style source replacing 'ID' with a style id and return it to assign to elements. The same source returns the same id and the style is released when the last element using it is destroyed, the id staying valid. If no variables are provided the current manager ones will be used"""
     if gss_variables is None:
         if UIState.current_manager is not None:
             gss_variables = UIState.current_manager.gss_variables
         else:
-            gss_variables = {}
-    ID: str = ""
-    for i in range(30):
-        ID += random.choice(string.ascii_lowercase+string.ascii_uppercase+"_")
+            gss_variables = _QUICK_STYLE_VARIABLES
     if not "ID" in style_source:
         raise UIError(
-            f"Source of quick style should include 'ID' for the style name, that will be later replaced with the actual id (in this case '{ID}')")
-    style_source = style_source.replace("ID", ID)
-    UIScript.parse_source(style_source, f"quickstyle.ID:{ID}.gss", gss_variables)
-    return ID
+            f"Source of quick style should include 'ID' for the style name, that will be later replaced with the actual id")
+    return UIScript.parse_inline_source(style_source, gss_variables)
 
 
 def set_default_style_id(style_id: str | None):